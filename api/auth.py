@@ -5,8 +5,8 @@ Handles user signup, login, logout, and profile management
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from sqlalchemy import func
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
 from typing import Optional
 
 from database.db import get_db
@@ -119,8 +119,7 @@ async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
         email=user_data.email,
         hashed_password=hashed_password,
         is_active=True,
-        is_verified=False,  # Could add email verification later
-        created_at=datetime.utcnow()
+        is_verified=False  # Could add email verification later
     )
     
     db.add(new_user)
@@ -170,7 +169,7 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Update last login
-    user.last_login = datetime.utcnow()
+    user.last_login = func.now()
     db.commit()
     
     # Create access token
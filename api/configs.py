@@ -4,6 +4,7 @@ Handles YAML config templates, user configs, validation
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime
 from typing import List
@@ -208,9 +209,7 @@ async def create_config(
         config_version=config_dict.get('config_version', '2.0'),
         strategy_name=config_dict.get('strategy_name'),
         bot_type=config_dict.get('bot_type'),
-        is_active=False,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow()
+        is_active=False
     )
     
     db.add(new_config)
@@ -268,7 +267,7 @@ async def update_config(
         config.strategy_name = config_dict.get('strategy_name')
         config.bot_type = config_dict.get('bot_type')
     
-    config.updated_at = datetime.utcnow()
+    config.updated_at = func.now()
     
     db.commit()
     db.refresh(config)
@@ -345,7 +344,7 @@ async def activate_config(
     
     # Activate selected config
     config.is_active = True
-    config.last_used_at = datetime.utcnow()
+    config.last_used_at = func.now()
     
     db.commit()
     
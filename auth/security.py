@@ -11,11 +11,17 @@ from cryptography.fernet import Fernet
 import os
 import base64
 
+# Test runs (TESTING=1) hash with bcrypt's minimum cost factor - every
+# signup/login in the suite hashes, and the default 12 rounds dominates runtime.
+# Hashes embed their rounds, so verify() still accepts production hashes.
+TESTING = os.getenv("TESTING") == "1"
+
 # Password hashing - configure bcrypt to handle truncation
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     deprecated="auto",
-    bcrypt__truncate_error=False  # Allow bcrypt to auto-truncate passwords
+    bcrypt__truncate_error=False,  # Allow bcrypt to auto-truncate passwords
+    **({"bcrypt__rounds": 4} if TESTING else {})
 )
 
 # JWT settings
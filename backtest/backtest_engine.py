@@ -6,6 +6,7 @@
 import logging
 import numpy as np
 import pandas as pd
+from dataclasses import dataclass
 from datetime import datetime, timedelta, UTC
 from typing import Dict, List, Optional, Tuple
 import sys
@@ -21,6 +22,30 @@ from config.strategy_constants import StrategyConstants
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class ResolvedStrategyParams:
+    """Strategy parameters resolved once per run (no dict lookups per bar)"""
+    aggressive: bool = False
+    min_signal_strength: float = 3
+    max_hold_time: float = 3600          # seconds
+    take_profit_pct: float = 0.012
+    stop_loss_pct: float = 0.006
+    
+    @classmethod
+    def from_dict(cls, strategy_params: Optional[Dict]) -> 'ResolvedStrategyParams':
+        """Resolve defaults from an optional strategy_params dict"""
+        if not strategy_params or strategy_params.get('strategy_mode') != 'aggressive':
+            return cls()
+        
+        return cls(
+            aggressive=True,
+            min_signal_strength=strategy_params.get('min_signal_strength', 3.0),
+            max_hold_time=strategy_params.get('time_stop_seconds', 600),
+            take_profit_pct=strategy_params.get('take_profit_pct', 0.012),
+            stop_loss_pct=strategy_params.get('stop_loss_pct', 0.006)
+        )
+
+
 class BacktestEngine:
     """
     Backtest Engine - จำลองการเทรดด้วยข้อมูลย้อนหลัง
@@ -51,13 +76,27 @@ class BacktestEngine:
             max_positions: Maximum concurrent positions
             position_size_pct: Position size as % of balance
         """
-        self.initial_balance = initial_balance
-        self.balance = initial_balance
         self.commission_rate = commission_rate
         self.slippage_pct = slippage_pct
         self.max_positions = max_positions
         self.position_size_pct = position_size_pct
         
+        self.reset(initial_balance)
+    
+    def reset(self, initial_balance: Optional[float] = None):
+        """
+        ล้างสถานะการเทรดเพื่อใช้ engine ซ้ำ (เช่น walk-forward หลาย periods)
+        
+        Trade / equity lists are replaced rather than cleared in place, since
+        earlier run_backtest() results still reference them.
+        
+        Args:
+            initial_balance: New starting capital (default: keep the current one)
+        """
+        if initial_balance is not None:
+            self.initial_balance = initial_balance
+        self.balance = self.initial_balance
+        
         # Trading state
         self.positions: Dict[str, Position] = {}
         self.trades: List[Dict] = []
@@ -67,8 +106,18 @@ class BacktestEngine:
         self.total_commission = 0
         self.total_slippage = 0
         
+        # Running trade stats (updated on every close, see get_metrics)
+        self._winning_trades = 0
+        self._losing_trades = 0
+        self._gross_profit = 0.0
+        self._gross_loss = 0.0
+        self._realized_pnl = 0.0
+        self._equity_peak: Optional[float] = None
+        self._max_drawdown = 0.0
+        
         # Strategy parameters (for aggressive mode support)
         self._current_strategy_params = None
+        self._params = ResolvedStrategyParams()
         
     def run_backtest(
         self,
@@ -89,22 +138,37 @@ class BacktestEngine:
         logger.info(f"💰 Initial Balance: ${self.initial_balance:,.2f}")
         logger.info(f"📊 Symbols: {len(data)}")
         
+        # Resolve strategy params once instead of per bar / per position
+        self._current_strategy_params = strategy_params
+        self._params = ResolvedStrategyParams.from_dict(strategy_params)
+        
         # Get common timestamps across all symbols
         timestamps = self._get_common_timestamps(data)
         logger.info(f"⏰ Total candles to process: {len(timestamps)}")
         
+        # Sort once and keep each symbol's timestamps as a NumPy array, so each
+        # bar is located with a binary search and history is a positional slice
+        # (no per-bar boolean masks over the whole DataFrame)
+        frames = {}
+        for symbol, df in data.items():
+            if not df['timestamp'].is_monotonic_increasing:
+                df = df.sort_values('timestamp', kind='stable')
+            df = df.reset_index(drop=True)
+            frames[symbol] = (df, df['timestamp'].to_numpy())
+        
         # Process each timestamp
         for i, timestamp in enumerate(timestamps):
             # Get current market data for all symbols
             current_data = {}
-            for symbol, df in data.items():
-                candle = df[df['timestamp'] == timestamp]
-                if len(candle) > 0:
+            ts = np.datetime64(timestamp)
+            for symbol, (df, ts_values) in frames.items():
+                start = ts_values.searchsorted(ts, side='left')
+                end = ts_values.searchsorted(ts, side='right')
+                if end > start:
                     # Get historical data up to this point
-                    historical = df[df['timestamp'] <= timestamp]
                     current_data[symbol] = {
-                        'current': candle.iloc[0],
-                        'historical': historical
+                        'current': df.iloc[start],
+                        'historical': df.iloc[:end]
                     }
             
             # Process this timestamp
@@ -124,9 +188,42 @@ class BacktestEngine:
             "equity_curve": self.equity_curve,
             "final_balance": self.balance,
             "total_commission": self.total_commission,
-            "total_slippage": self.total_slippage
+            "total_slippage": self.total_slippage,
+            "metrics": self.get_metrics()
         }
     
+    def get_metrics(self) -> Dict:
+        """
+        Headline metrics tracked online while trades close
+        
+        Same definitions as PerformanceMetrics.calculate_metrics for these
+        keys, without a second pass over the trades. Use the calculator for
+        the full report (Sharpe, per-symbol, time-of-day stats).
+        """
+        total_trades = len(self.trades)
+        total_pnl = self._realized_pnl
+        
+        return {
+            "initial_balance": self.initial_balance,
+            "final_balance": self.initial_balance + total_pnl,
+            "total_pnl": total_pnl,
+            "total_return_pct": total_pnl / self.initial_balance * 100,
+            "total_trades": total_trades,
+            "winning_trades": self._winning_trades,
+            "losing_trades": self._losing_trades,
+            "breakeven_trades": total_trades - self._winning_trades - self._losing_trades,
+            "win_rate": (self._winning_trades / total_trades * 100) if total_trades > 0 else 0,
+            "gross_profit": self._gross_profit,
+            "gross_loss": self._gross_loss,
+            "profit_factor": (self._gross_profit / self._gross_loss) if self._gross_loss > 0 else float('inf'),
+            "max_drawdown": self._max_drawdown,
+            "max_drawdown_pct": (self._max_drawdown / self.initial_balance * 100) if self.initial_balance > 0 else 0
+        }
+    
+    def iter_trades(self):
+        """Iterate closed trades in order (for streaming them to disk)"""
+        yield from self.trades
+    
     def _process_timestamp(
         self,
         timestamp: datetime,
@@ -172,9 +269,7 @@ class BacktestEngine:
             
             # Check entry conditions
             # For aggressive mode, check signal strength threshold
-            min_signal_strength = 3  # Default
-            if strategy_params and strategy_params.get('strategy_mode') == 'aggressive':
-                min_signal_strength = strategy_params.get('min_signal_strength', 3.0)
+            min_signal_strength = self._params.min_signal_strength
             
             if self._should_enter_long(signals, min_signal_strength):
                 self._open_position(symbol, 'LONG', timestamp, data['current'], strategy_params)
@@ -208,13 +303,8 @@ class BacktestEngine:
             entry_time_naive = position.entry_time.replace(tzinfo=None) if position.entry_time.tzinfo else position.entry_time
             hold_time = (timestamp - entry_time_naive).total_seconds()
             
-            # Use strategy_params time_stop if available
-            strategy_params = getattr(self, '_current_strategy_params', None)
-            max_hold_time = 3600  # Default 1 hour
-            if strategy_params and strategy_params.get('strategy_mode') == 'aggressive':
-                max_hold_time = strategy_params.get('time_stop_seconds', 600)
-            
-            if hold_time > max_hold_time:
+            # Use strategy_params time_stop if available (default 1 hour)
+            if hold_time > self._params.max_hold_time:
                 positions_to_close.append((symbol, current_price, 'TIME_EXIT'))
                 continue
             
@@ -388,10 +478,10 @@ class BacktestEngine:
         self.total_commission += commission
         
         # Calculate SL/TP based on strategy mode
-        if strategy_params and strategy_params.get('strategy_mode') == 'aggressive':
+        if self._params.aggressive:
             # Use aggressive parameters from strategy_params
-            tp_pct = strategy_params.get('take_profit_pct', 0.012)  # Default 1.2%
-            sl_pct = strategy_params.get('stop_loss_pct', 0.006)    # Default 0.6%
+            tp_pct = self._params.take_profit_pct  # Default 1.2%
+            sl_pct = self._params.stop_loss_pct    # Default 0.6%
             
             if side == 'LONG':
                 stop_loss = entry_price * (1 - sl_pct)
@@ -479,6 +569,19 @@ class BacktestEngine:
         
         self.trades.append(trade)
         
+        # Running stats (trades close in time order, so this is the equity curve)
+        if pnl > 0:
+            self._winning_trades += 1
+            self._gross_profit += pnl
+        elif pnl < 0:
+            self._losing_trades += 1
+            self._gross_loss -= pnl
+        self._realized_pnl += pnl
+        equity = self.initial_balance + self._realized_pnl
+        if self._equity_peak is None or equity > self._equity_peak:
+            self._equity_peak = equity
+        self._max_drawdown = min(self._max_drawdown, equity - self._equity_peak)
+        
         # Remove position
         del self.positions[symbol]
         
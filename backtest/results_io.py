@@ -0,0 +1,93 @@
+"""
+💾 Backtest Results I/O
+บันทึกผล backtest เป็น JSON / NDJSON (ใช้ orjson ถ้ามี)
+"""
+
+import logging
+import json
+from pathlib import Path
+from typing import Any, Iterable, List, Union
+
+logger = logging.getLogger(__name__)
+
+# Fast JSON encoders are optional - fall back to stdlib json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ujson
+    UJSON_AVAILABLE = True
+except ImportError:
+    UJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """Fallback encoder: numpy scalars -> Python values, anything else -> str()"""
+    if hasattr(obj, 'item'):
+        return obj.item()
+    return str(obj)
+
+
+def dumps_json(data: Any, indent: bool = True) -> bytes:
+    """
+    Serialize results to JSON bytes
+
+    numpy scalars/arrays are encoded natively by orjson (and unwrapped with
+    .item() on the fallback encoders); anything else unknown (pandas
+    Timestamp, Enum, ...) is written with str(). Non-str dict keys (the
+    int hours in time_stats['by_hour']) become strings, as with stdlib json.
+
+    Args:
+        data: Object to serialize
+        indent: Pretty-print with 2-space indentation
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option, default=_default)
+
+    if UJSON_AVAILABLE:
+        return ujson.dumps(data, indent=2 if indent else 0, default=_default).encode('utf-8')
+
+    return json.dumps(data, indent=2 if indent else None, default=_default).encode('utf-8')
+
+
+def write_json(path: Union[str, Path], data: Any, indent: bool = True) -> Path:
+    """Serialize results and write them with a single write call"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(dumps_json(data, indent=indent))
+    return path
+
+
+def write_ndjson(path: Union[str, Path], rows: Iterable[Any]) -> int:
+    """
+    Stream rows to a newline-delimited JSON file, one row per line
+
+    Rows are encoded one at a time, so no serialized copy of the whole
+    list is built. Read back with read_ndjson() or pd.read_json(path, lines=True).
+
+    Returns:
+        Number of rows written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    count = 0
+    with open(path, 'wb') as f:
+        for row in rows:
+            f.write(dumps_json(row, indent=False))
+            f.write(b'\n')
+            count += 1
+    return count
+
+
+def read_ndjson(path: Union[str, Path]) -> List[Any]:
+    """Load every row of a newline-delimited JSON file"""
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    with open(path, 'rb') as f:
+        return [loads(line) for line in f if line.strip()]
@@ -0,0 +1,75 @@
+"""
+📐 Backtest Statistics Kernels
+สถิติสรุปแบบ single-pass (ใช้ Numba ถ้ามี)
+"""
+
+import logging
+from typing import NamedTuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Numba is optional - fall back to NumPy reductions without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+class SeriesSummary(NamedTuple):
+    """mean / population std / min / max / count of positive values"""
+    mean: float
+    std: float
+    min: float
+    max: float
+    positive: int
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _summarize_nb(values):
+        """Fused one-pass reduction over a float64 array"""
+        n = values.size
+        total = 0.0
+        total_sq = 0.0
+        lo = values[0]
+        hi = values[0]
+        positive = 0
+        for i in range(n):
+            v = values[i]
+            total += v
+            total_sq += v * v
+            lo = min(lo, v)
+            hi = max(hi, v)
+            if v > 0:
+                positive += 1
+        mean = total / n
+        return mean, max(total_sq / n - mean * mean, 0.0) ** 0.5, lo, hi, positive
+    
+    # Pay the JIT compile cost at import, not inside the first report
+    _summarize_nb(np.zeros(1, dtype=np.float64))
+
+
+def summarize(values) -> SeriesSummary:
+    """
+    สรุปสถิติของ series (เช่น return ต่อ period)
+    
+    Args:
+        values: Non-empty sequence of numbers
+    
+    Returns:
+        SeriesSummary(mean, std, min, max, positive)
+    """
+    arr = np.ascontiguousarray(values, dtype=np.float64)
+    if arr.size == 0:
+        raise ValueError("summarize() needs at least one value")
+    
+    if NUMBA_AVAILABLE:
+        mean, std, lo, hi, positive = _summarize_nb(arr)
+        return SeriesSummary(float(mean), float(std), float(lo), float(hi), int(positive))
+    
+    return SeriesSummary(
+        float(arr.mean()), float(arr.std()), float(arr.min()), float(arr.max()), int((arr > 0).sum())
+    )
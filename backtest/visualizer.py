@@ -9,6 +9,13 @@ import numpy as np
 from typing import Dict, List
 from datetime import datetime
 import json
+import sys
+from pathlib import Path
+
+# Add parent directory for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest.results_io import read_ndjson
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +59,9 @@ class BacktestVisualizer:
                 data = json.load(f)
             
             self.trades = data.get('trades', [])
+            if not self.trades and data.get('trades_file'):
+                # Trades streamed to a sidecar NDJSON file next to the results
+                self.trades = read_ndjson(Path(filepath).parent / data['trades_file'])
             self.equity_curve = data.get('equity_curve', [])
             self.metrics = data.get('metrics', {})
             
@@ -67,6 +67,8 @@ logger = logging.getLogger(__name__)
 class AggressiveRecoveryBot:
     """Aggressive Recovery Bot - Fast Profit + Smart Loss Recovery"""
     
+    STATE_FILE: str = "bot_state_aggressive.json"
+    
     def __init__(self, user_id: Optional[int] = None, config_dict: Optional[dict] = None):
         """Initialize bot with optional user_id and config for multi-user support"""
         self.user_id = user_id
@@ -268,21 +270,20 @@ class AggressiveRecoveryBot:
             return
         
         try:
-            import requests
+            from utils.telegram_session import get_telegram_session
             url = f"https://api.telegram.org/bot{Config.TELEGRAM_BOT_TOKEN}/sendMessage"
             data = {"chat_id": Config.TELEGRAM_CHAT_ID, "text": message, "parse_mode": "HTML"}
-            requests.post(url, data=data, timeout=5)
+            get_telegram_session().post(url, data=data, timeout=5)
         except Exception as e:
             logger.warning(f"Telegram send failed: {e}")
     
     def load_state(self):
         """Load bot state from file"""
-        state_file = "bot_state_aggressive.json"
-        if not os.path.exists(state_file):
+        if not os.path.exists(self.STATE_FILE):
             return
         
         try:
-            with open(state_file, 'r') as f:
+            with open(self.STATE_FILE, 'r') as f:
                 state = json.load(f)
             
             self.profit_locked = state.get("profit_locked", False)
@@ -304,7 +305,6 @@ class AggressiveRecoveryBot:
     
     def save_state(self):
         """Save bot state to file"""
-        state_file = "bot_state_aggressive.json"
         try:
             state = {
                 "profit_locked": self.profit_locked,
@@ -316,7 +316,7 @@ class AggressiveRecoveryBot:
                 "last_update": datetime.now(UTC).isoformat()
             }
             
-            with open(state_file, 'w') as f:
+            with open(self.STATE_FILE, 'w') as f:
                 json.dump(state, f, indent=2)
         
         except Exception as e:
@@ -724,7 +724,7 @@ class AggressiveRecoveryBot:
             
             # 3. Fast Time Stop (aggressive)
             if exit_reason is None:
-                time_in_position = (datetime.now(UTC) - position.entry_time).total_seconds()
+                time_in_position = position.held_seconds()
                 is_recovery = symbol in self.recovery_positions and position in self.recovery_positions.get(symbol, [])
                 time_limit = Config.AGGRESSIVE_TIME_STOP_RECOVERY if is_recovery else Config.AGGRESSIVE_TIME_STOP_FAST
                 
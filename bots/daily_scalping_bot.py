@@ -245,10 +245,10 @@ class DailyScalpingBot:
             return
         
         try:
-            import requests
+            from utils.telegram_session import get_telegram_session
             url = f"https://api.telegram.org/bot{Config.TELEGRAM_BOT_TOKEN}/sendMessage"
             data = {"chat_id": Config.TELEGRAM_CHAT_ID, "text": message, "parse_mode": "HTML"}
-            requests.post(url, data=data, timeout=5)
+            get_telegram_session().post(url, data=data, timeout=5)
         except Exception as e:
             logger.warning(f"Telegram send failed: {e}")
     
@@ -944,7 +944,7 @@ class DailyScalpingBot:
             
             # 3. Time Stop
             if exit_reason is None:
-                time_in_position = (datetime.now(UTC) - position.entry_time).total_seconds()
+                time_in_position = position.held_seconds()
                 # Use adaptive time stop based on signal strength
                 time_stop = Config.TIME_STOP_STRONG_SIGNAL if position.confluence_score >= 4 else Config.TIME_STOP_BASE
                 if time_in_position >= time_stop:
@@ -1312,7 +1312,7 @@ class DailyScalpingBot:
                     else:
                         pnl_pct = -pnl_pct
                     
-                    time_held = int((datetime.now(UTC) - pos.entry_time).total_seconds())
+                    time_held = int(pos.held_seconds())
                     status_emoji = "🟢" if pnl_pct > 0 else "🔴"
                     
                     logger.info(f"  {status_emoji} {pos.symbol}: {pos.side} @ ${pos.entry_price:.2f} | "
@@ -6,13 +6,25 @@ Loads YAML configs and automatically upgrades old versions
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
+from functools import lru_cache
 from pydantic import ValidationError
+import copy
 import shutil
 from datetime import datetime
 
 from .schema import ConfigSchema
 from .migrations import ConfigMigration
 
+# libyaml C loader/dumper when available (pure-Python fallback otherwise)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CDumper", yaml.Dumper)
+
+
+@lru_cache(maxsize=8)
+def _load_template_file(template_path: str, mtime: float) -> Dict[str, Any]:
+    """Parse + validate a template once per file revision (callers must copy)"""
+    return ConfigLoader.load_config(template_path, auto_migrate=False)
+
 
 class ConfigLoader:
     """Load and validate config files with auto-migration"""
@@ -43,7 +55,7 @@ class ConfigLoader:
         # 1. Load YAML
         try:
             with open(path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
         except yaml.YAMLError as e:
             raise ValueError(f"Invalid YAML syntax: {e}")
         
@@ -76,9 +88,9 @@ class ConfigLoader:
         
         # 3. Validate schema
         try:
-            validated = ConfigSchema(**config)
+            validated = ConfigSchema.model_validate(config)
             print(f"✅ Config validation passed\n")
-            return validated.dict()
+            return validated.model_dump()
         except ValidationError as e:
             error_msg = "Config validation failed:\n"
             for error in e.errors():
@@ -106,7 +118,7 @@ class ConfigLoader:
                 f"Available: {', '.join(available)}"
             )
         
-        return ConfigLoader.load_config(str(template_file), auto_migrate=False)
+        return copy.deepcopy(_load_template_file(str(template_file), template_file.stat().st_mtime))
     
     @staticmethod
     def list_templates() -> list:
@@ -117,7 +129,7 @@ class ConfigLoader:
         templates = []
         for file in ConfigLoader.TEMPLATES_DIR.glob("*.yaml"):
             try:
-                config = ConfigLoader.load_config(str(file), auto_migrate=False)
+                config = _load_template_file(str(file), file.stat().st_mtime)
                 templates.append({
                     'name': file.stem,
                     'file': file.name,
@@ -143,7 +155,7 @@ class ConfigLoader:
         """
         try:
             # Parse YAML
-            config = yaml.safe_load(yaml_string)
+            config = yaml.load(yaml_string, Loader=_YAML_LOADER)
             
             if not isinstance(config, dict):
                 return False, "Config must be a YAML dictionary/object", None
@@ -154,8 +166,8 @@ class ConfigLoader:
                 config = ConfigMigration.migrate(config)
             
             # Validate schema
-            validated = ConfigSchema(**config)
-            return True, None, validated.dict()
+            validated = ConfigSchema.model_validate(config)
+            return True, None, validated.model_dump()
             
         except yaml.YAMLError as e:
             return False, f"Invalid YAML syntax: {e}", None
@@ -181,7 +193,7 @@ class ConfigLoader:
         
         # Save migrated config
         with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(new_config, f, allow_unicode=True, indent=2, sort_keys=False)
+            yaml.dump(new_config, f, Dumper=_YAML_DUMPER, allow_unicode=True, indent=2, sort_keys=False)
         
         print(f"💾 Updated config saved: {config_path.name}\n")
     
@@ -195,12 +207,12 @@ class ConfigLoader:
             file_path: Path to save file
         """
         # Validate before saving
-        validated = ConfigSchema(**config)
+        validated = ConfigSchema.model_validate(config)
         
         path = Path(file_path)
         path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(path, 'w', encoding='utf-8') as f:
-            yaml.dump(validated.dict(), f, allow_unicode=True, indent=2, sort_keys=False)
+            yaml.dump(validated.model_dump(), f, Dumper=_YAML_DUMPER, allow_unicode=True, indent=2, sort_keys=False)
         
         print(f"💾 Config saved: {path}")
@@ -31,6 +31,10 @@ class ConfigMigration:
         config_version = config.get('config_version', '1.0')
         original_version = config_version
         
+        # Already current - nothing to walk
+        if config_version == ConfigMigration.CURRENT_VERSION:
+            return config
+        
         print(f"\n🔄 Config Migration Started")
         print(f"   From: v{config_version}")
         print(f"   To:   v{ConfigMigration.CURRENT_VERSION}\n")
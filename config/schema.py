@@ -3,7 +3,7 @@ Config Schema Validation using Pydantic
 Ensures all configs meet required structure and types
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Literal, Optional
 from enum import Enum
 
@@ -28,6 +28,9 @@ class ConfigSchema(BaseModel):
     Config Schema v2.0
     All configs must conform to this schema
     """
+    # Validated once and dumped straight to a dict - no assignment validation needed
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+    
     # Version tracking
     config_version: str = Field(default="2.0", description="Config version")
     
@@ -69,25 +72,24 @@ class ConfigSchema(BaseModel):
     max_drawdown_percent: Optional[float] = Field(default=15.0, ge=5.0, le=30.0)
     
     # Symbols
-    symbols: List[str] = Field(min_items=1, max_items=12, description="Trading symbols")
+    symbols: List[str] = Field(min_length=1, max_length=12, description="Trading symbols")
     
-    @validator('strategy_name')
+    @field_validator('strategy_name')
+    @classmethod
     def validate_strategy_name(cls, v):
         """Validate strategy name"""
         if len(v.strip()) < 3:
             raise ValueError("Strategy name must be at least 3 characters")
         return v.strip()
     
-    @validator('symbols')
+    @field_validator('symbols')
+    @classmethod
     def validate_symbols(cls, v):
         """Validate symbol format"""
         for symbol in v:
             if not symbol.endswith('USDT'):
                 raise ValueError(f"Symbol {symbol} must end with USDT")
         return v
-    
-    class Config:
-        use_enum_values = True
 
 
 class ConfigSchemaV1_5(BaseModel):
@@ -7,6 +7,36 @@ import numpy as np
 import pandas as pd
 from typing import Tuple, List
 
+# Numba is optional - fall back to pandas ewm without it
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _macd_nb(prices, fast, slow, signal):
+        """Fast/slow/signal EMA recursions (adjust=False) fused into one pass"""
+        a_fast = 2.0 / (fast + 1)
+        a_slow = 2.0 / (slow + 1)
+        a_signal = 2.0 / (signal + 1)
+        ema_fast = prices[0]
+        ema_slow = prices[0]
+        macd = 0.0
+        signal_line = 0.0
+        for i in range(1, prices.size):
+            v = prices[i]
+            ema_fast += a_fast * (v - ema_fast)
+            ema_slow += a_slow * (v - ema_slow)
+            macd = ema_fast - ema_slow
+            signal_line += a_signal * (macd - signal_line)
+        return macd, signal_line, macd - signal_line
+    
+    # Pay the JIT compile cost at import, not on the first trading cycle
+    _macd_nb(np.zeros(2, dtype=np.float64), 12, 26, 9)
+
 
 class Indicators:
     """คำนวณ Technical Indicators ต่างๆ"""
@@ -17,12 +47,11 @@ class Indicators:
         if len(prices) < period + 1:
             return 50.0
         
-        deltas = np.diff(prices)
-        gains = np.where(deltas > 0, deltas, 0)
-        losses = np.where(deltas < 0, -deltas, 0)
+        # Only the last `period` deltas are averaged - don't diff the whole history
+        deltas = np.diff(prices[-(period + 1):])
         
-        avg_gain = np.mean(gains[-period:])
-        avg_loss = np.mean(losses[-period:])
+        avg_gain = deltas[deltas > 0].sum() / period
+        avg_loss = -deltas[deltas < 0].sum() / period
         
         if avg_loss == 0:
             return 100.0
@@ -37,8 +66,11 @@ class Indicators:
         if len(prices) < period:
             return 0.0, 0.0, 0.0
         
-        sma = np.mean(prices[-period:])
-        std = np.std(prices[-period:])
+        # Slice once; population std reuses the mean instead of np.std recomputing it
+        window = np.asarray(prices[-period:], dtype=np.float64)
+        sma = window.mean()
+        deviation = window - sma
+        std = np.sqrt(np.dot(deviation, deviation) / period)
         
         upper = sma + (std_dev * std)
         lower = sma - (std_dev * std)
@@ -51,6 +83,9 @@ class Indicators:
         if len(prices) < slow + signal:
             return 0.0, 0.0, 0.0
         
+        if NUMBA_AVAILABLE:
+            return _macd_nb(np.ascontiguousarray(prices, dtype=np.float64), fast, slow, signal)
+        
         # EMA Calculation
         ema_fast = pd.Series(prices).ewm(span=fast, adjust=False).mean()
         ema_slow = pd.Series(prices).ewm(span=slow, adjust=False).mean()
@@ -67,17 +102,13 @@ class Indicators:
         if len(high) < period + 1:
             return 0.0
         
-        tr_list = []
-        for i in range(1, len(high)):
-            tr = max(
-                high[i] - low[i],
-                abs(high[i] - close[i - 1]),
-                abs(low[i] - close[i - 1])
-            )
-            tr_list.append(tr)
-        
-        atr = np.mean(tr_list[-period:])
-        return atr
+        # True range of the last `period` candles only (each needs the previous close)
+        high = np.asarray(high[-period:], dtype=np.float64)
+        low = np.asarray(low[-period:], dtype=np.float64)
+        prev_close = np.asarray(close[-(period + 1):-1], dtype=np.float64)
+        
+        tr = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+        return tr.mean()
     
     @staticmethod
     def find_support_resistance(prices: np.ndarray, window: int = 5) -> Tuple[List[float], List[float]]:
@@ -3,6 +3,7 @@ Data models for Position and Trade tracking
 Enhanced for multi-symbol trading
 """
 
+import time
 from datetime import datetime, UTC
 from typing import Optional, List
 
@@ -10,9 +11,18 @@ from typing import Optional, List
 class Position:
     """ข้อมูล Position ปัจจุบัน - Enhanced for multi-symbol"""
     
+    # Fixed attribute set: slot access is cheaper than a __dict__ lookup on
+    # the per-tick trailing-stop path (new fields must be added here too)
+    __slots__ = (
+        'symbol', 'position_id', 'side', 'entry_price', 'quantity',
+        'stop_loss', 'take_profit', 'confluence_score', 'entry_time', 'entry_monotonic',
+        'exit_price', 'exit_time', 'profit_percent', 'profit_amount', 'exit_reason',
+        'trailing_stop_active', 'highest_price', 'lowest_price', 'partial_tp_hit'
+    )
+    
     def __init__(self, symbol: str, side: str, entry_price: float, quantity: float, 
                  stop_loss: float, take_profit: float, confluence_score: int,
-                 position_id: Optional[str] = None):
+                 position_id: Optional[str] = None) -> None:
         self.symbol = symbol  # NEW: Track which symbol
         self.position_id = position_id or f"{symbol}_{datetime.now(UTC).timestamp()}"  # NEW: Unique ID
         self.side = side  # "BUY" or "SELL"
@@ -22,6 +32,7 @@ class Position:
         self.take_profit = take_profit
         self.confluence_score = confluence_score
         self.entry_time = datetime.now(UTC)
+        self.entry_monotonic = time.monotonic()  # For hold durations (immune to clock jumps)
         self.exit_price: Optional[float] = None
         self.exit_time: Optional[datetime] = None
         self.profit_percent: Optional[float] = None
@@ -29,14 +40,18 @@ class Position:
         self.exit_reason: Optional[str] = None
         
         # Trailing stop fields
-        self.trailing_stop_active = False
-        self.highest_price = entry_price if side == "BUY" else None
-        self.lowest_price = entry_price if side == "SELL" else None
+        self.trailing_stop_active: bool = False
+        self.highest_price: Optional[float] = entry_price if side == "BUY" else None
+        self.lowest_price: Optional[float] = entry_price if side == "SELL" else None
         
         # Partial TP tracking
-        self.partial_tp_hit = False  # NEW: Track if partial TP was hit
+        self.partial_tp_hit: bool = False  # NEW: Track if partial TP was hit
+    
+    def held_seconds(self) -> float:
+        """Seconds since entry (monotonic clock - cheaper than datetime math per tick)"""
+        return time.monotonic() - self.entry_monotonic
     
-    def update_trailing_stop(self, current_price: float, trail_percent: float = 0.3):
+    def update_trailing_stop(self, current_price: float, trail_percent: float = 0.3) -> None:
         """Update trailing stop levels"""
         if self.side == "BUY":
             if current_price > self.highest_price:
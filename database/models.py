@@ -3,8 +3,8 @@ Database Models for Trading Bot
 PostgreSQL schema definitions using SQLAlchemy
 """
 
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum
+from datetime import datetime, UTC
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, Text, Enum, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 import enum
@@ -12,6 +12,17 @@ import enum
 Base = declarative_base()
 
 
+def _utcnow() -> datetime:
+    """
+    Python-side insert default for timestamp columns
+    
+    Kept next to server_default=func.now(): create_all() never alters
+    existing tables, so databases created before the server defaults
+    existed have no column default and would store NULL without it.
+    """
+    return datetime.now(UTC)
+
+
 class OrderSide(str, enum.Enum):
     BUY = "BUY"
     SELL = "SELL"
@@ -45,8 +56,8 @@ class User(Base):
     # Settings
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    last_login = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
+    last_login = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     trades = relationship("Trade", back_populates="user", cascade="all, delete-orphan")
@@ -57,6 +68,10 @@ class User(Base):
 class BotConfig(Base):
     """Bot configuration per user (stores complete YAML config)"""
     __tablename__ = "bot_configs"
+    __table_args__ = (
+        # Active-config lookup: WHERE user_id = ? AND is_active
+        Index("ix_botconfig_user_active", "user_id", "is_active"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -74,9 +89,9 @@ class BotConfig(Base):
     is_active = Column(Boolean, default=False)  # Currently selected config
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_used_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), onupdate=func.now())
+    last_used_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="bot_configs")
@@ -113,8 +128,8 @@ class Trade(Base):
     signal_strength = Column(Float, nullable=True)
     
     # Timestamps
-    entry_time = Column(DateTime, default=datetime.utcnow, index=True)
-    exit_time = Column(DateTime, nullable=True)
+    entry_time = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), index=True)
+    exit_time = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     user = relationship("User", back_populates="trades")
@@ -146,7 +161,7 @@ class DailyPerformance(Base):
     best_trade_profit = Column(Float, default=0.0)
     worst_trade_loss = Column(Float, default=0.0)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
 
 
 # ==================== ALERT/LOG MODEL ====================
@@ -166,7 +181,7 @@ class Alert(Base):
     is_read = Column(Boolean, default=False)
     is_sent_telegram = Column(Boolean, default=False)
     
-    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now(), index=True)
 
 
 # ==================== MARKET DATA CACHE ====================
@@ -192,4 +207,4 @@ class MarketDataCache(Base):
     bb_upper = Column(Float, nullable=True)
     bb_lower = Column(Float, nullable=True)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), default=_utcnow, server_default=func.now())
@@ -3,14 +3,14 @@ Position Manager for Multi-Position Tracking
 Handles multiple concurrent positions across symbols
 """
 
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from core.models import Position
 
 
 class PositionManager:
     """จัดการ multiple positions พร้อมกันหลาย symbols"""
     
-    def __init__(self, max_total_positions: int = 10, max_per_symbol: int = 2):
+    def __init__(self, max_total_positions: int = 10, max_per_symbol: int = 2) -> None:
         """
         Args:
             max_total_positions: Maximum total open positions
@@ -89,13 +89,10 @@ class PositionManager:
     
     def can_open_position(self, symbol: str) -> bool:
         """Check if we can open a new position for this symbol"""
-        if self.get_position_count() >= self.max_total_positions:
-            return False
-        
-        if self.get_symbol_position_count(symbol) >= self.max_per_symbol:
-            return False
-        
-        return True
+        # Called per symbol on every tick - read the containers directly
+        # (empty tuple avoids allocating a list for symbols with no positions)
+        return (len(self.positions) < self.max_total_positions
+                and len(self.symbol_positions.get(symbol, ())) < self.max_per_symbol)
     
     def get_total_exposure(self) -> float:
         """Calculate total capital exposure (sum of all position values)"""
@@ -126,7 +123,7 @@ class PositionManager:
         
         return min(positions, key=lambda p: p.entry_time)
     
-    def get_positions_summary(self) -> Dict:
+    def get_positions_summary(self) -> Dict[str, Any]:
         """Get summary statistics of all positions"""
         if not self.positions:
             return {
@@ -137,7 +134,7 @@ class PositionManager:
             }
         
         # Count by symbol
-        by_symbol = {}
+        by_symbol: Dict[str, int] = {}
         for symbol, pos_ids in self.symbol_positions.items():
             by_symbol[symbol] = len(pos_ids)
         
@@ -152,7 +149,7 @@ class PositionManager:
             "total_exposure": self.get_total_exposure()
         }
     
-    def clear_all(self):
+    def clear_all(self) -> None:
         """Clear all positions (use with caution!)"""
         self.positions.clear()
         self.symbol_positions.clear()
@@ -4,7 +4,8 @@ Handles momentum scoring and symbol rotation
 """
 
 import time
-from typing import List, Dict, Optional
+from itertools import chain
+from typing import List, Dict, Optional, Set
 from datetime import datetime, UTC
 import numpy as np
 
@@ -22,20 +23,52 @@ class SymbolManager:
         self.symbol_pool = symbol_pool
         self.max_active = max_active
         self.rotation_interval = rotation_interval
-        self.last_rotation_time = time.time()
+        self._mark_rotation()
         
         # Active trading symbols (start with first max_active symbols)
         self.active_symbols: List[str] = symbol_pool[:max_active]
+        self._active_set = frozenset(self.active_symbols)
         
-        # Momentum scores for each symbol
-        self.momentum_scores: Dict[str, float] = {symbol: 0.0 for symbol in symbol_pool}
-        
-        # Performance tracking
-        self.symbol_performance: Dict[str, Dict] = {
-            symbol: {"score": 0.0, "last_update": time.time()}
-            for symbol in symbol_pool
+        # Momentum scores and last update times as parallel arrays (one slot per symbol)
+        self._symbol_index: Dict[str, int] = {symbol: i for i, symbol in enumerate(symbol_pool)}
+        self._scores = np.zeros(len(symbol_pool), dtype=np.float64)
+        self._last_update = np.full(len(symbol_pool), time.time(), dtype=np.float64)
+    
+    def _mark_rotation(self):
+        """Record a rotation and precompute the next rotation deadline"""
+        # Monotonic clock for scheduling; wall clock kept only for display
+        self.last_rotation_time = time.monotonic()
+        self._next_rotation_ts = self.last_rotation_time + self.rotation_interval
+        self._last_rotation_display = datetime.fromtimestamp(time.time(), UTC).strftime("%H:%M:%S")
+    
+    @property
+    def momentum_scores(self) -> Dict[str, float]:
+        """Momentum scores for each symbol ({symbol: score})"""
+        return dict(zip(self.symbol_pool, self._scores.tolist()))
+    
+    @property
+    def symbol_performance(self) -> Dict[str, Dict]:
+        """Performance tracking ({symbol: {"score", "last_update"}})"""
+        return {
+            symbol: {"score": score, "last_update": last_update}
+            for symbol, score, last_update in zip(
+                self.symbol_pool, self._scores.tolist(), self._last_update.tolist()
+            )
         }
     
+    def _top_indices(self, k: int) -> np.ndarray:
+        """Indices of the k highest scores, best first (ties keep pool order)"""
+        k = min(k, len(self._scores))
+        if k <= 0:
+            return np.empty(0, dtype=np.intp)
+        # k-th best score via partial sort; everything above it is in, then
+        # the lowest-index entries equal to it fill the remaining slots
+        kth = -np.partition(-self._scores, k - 1)[k - 1]
+        above = np.flatnonzero(self._scores > kth)
+        ties = np.flatnonzero(self._scores == kth)[:k - len(above)]
+        idx = np.concatenate((above, ties))
+        return idx[np.lexsort((idx, -self._scores[idx]))]
+    
     def calculate_momentum_score(self, symbol_data: Dict) -> float:
         """
         Calculate momentum score for a symbol
@@ -76,17 +109,59 @@ class SymbolManager:
         )
         
         return total_score
-    
+
+    def calculate_momentum_scores_batch(self, price_change_pct: np.ndarray, volume_ratio: np.ndarray,
+                                        atr: np.ndarray, current_price: np.ndarray) -> np.ndarray:
+        """
+        Vectorized calculate_momentum_score for many symbols at once
+
+        Args:
+            price_change_pct, volume_ratio, atr, current_price: Equal-length arrays,
+                one element per symbol (same meaning as the scalar version)
+
+        Returns:
+            Array of momentum scores
+        """
+        price_change_pct = np.asarray(price_change_pct, dtype=np.float64)
+        volume_ratio = np.asarray(volume_ratio, dtype=np.float64)
+        atr = np.asarray(atr, dtype=np.float64)
+        current_price = np.asarray(current_price, dtype=np.float64)
+
+        price_score = np.abs(price_change_pct) * 10
+        volume_score = np.minimum(volume_ratio * 20, 100.0)
+        volatility_score = np.divide(atr, current_price, out=np.zeros_like(atr),
+                                     where=current_price > 0) * 1000
+
+        return 0.4 * price_score + 0.3 * volume_score + 0.3 * volatility_score
+
     def update_momentum(self, symbol: str, symbol_data: Dict):
         """Update momentum score for a symbol"""
-        score = self.calculate_momentum_score(symbol_data)
-        self.momentum_scores[symbol] = score
-        self.symbol_performance[symbol]["score"] = score
-        self.symbol_performance[symbol]["last_update"] = time.time()
+        i = self._symbol_index[symbol]
+        self._scores[i] = self.calculate_momentum_score(symbol_data)
+        self._last_update[i] = time.time()
+
+    def update_momentum_batch(self, symbols: List[str], symbol_data: Dict[str, np.ndarray]):
+        """
+        Update momentum scores for several symbols in one vectorized pass
+
+        Args:
+            symbols: Symbols to update
+            symbol_data: {"price_change_pct": array, "volume_ratio": array,
+                          "atr": array, "current_price": array}, aligned with symbols
+        """
+        n = len(symbols)
+        idx = [self._symbol_index[symbol] for symbol in symbols]
+        self._scores[idx] = self.calculate_momentum_scores_batch(
+            symbol_data.get("price_change_pct", np.zeros(n)),
+            symbol_data.get("volume_ratio", np.ones(n)),
+            symbol_data.get("atr", np.zeros(n)),
+            symbol_data.get("current_price", np.ones(n))
+        )
+        self._last_update[idx] = time.time()
     
     def should_rotate(self) -> bool:
         """Check if it's time to rotate symbols"""
-        return (time.time() - self.last_rotation_time) >= self.rotation_interval
+        return time.monotonic() >= self._next_rotation_ts
     
     def rotate_symbols(self, current_positions: Dict[str, int]) -> List[str]:
         """
@@ -98,32 +173,34 @@ class SymbolManager:
         Returns:
             Updated list of active symbols
         """
-        # Sort symbols by momentum score
-        sorted_symbols = sorted(
-            self.momentum_scores.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        
-        # Get top N symbols
-        top_symbols = [symbol for symbol, score in sorted_symbols[:self.max_active]]
+        # Get top N symbols by momentum score (partial sort, no full ranking)
+        top_symbols = [self.symbol_pool[i] for i in self._top_indices(self.max_active)]
         
         # Don't remove symbols with open positions
         protected_symbols = [s for s, count in current_positions.items() if count > 0]
         
         # Combine: protected + top momentum (up to max_active)
-        new_active = list(set(protected_symbols + top_symbols))[:self.max_active]
-        
-        # If we still have room, add from top scorers
-        if len(new_active) < self.max_active:
-            for symbol, score in sorted_symbols:
-                if symbol not in new_active:
-                    new_active.append(symbol)
-                    if len(new_active) >= self.max_active:
-                        break
+        # Single pass with a companion set: protected symbols first, then by
+        # momentum rank, O(1) membership per candidate
+        new_active: List[str] = []
+        seen: Set[str] = set()
+        for symbol in chain(protected_symbols, top_symbols):
+            if symbol in seen:
+                continue
+            new_active.append(symbol)
+            seen.add(symbol)
+            if len(new_active) >= self.max_active:
+                break
+        
+        self._mark_rotation()
+        
+        # Same set as before - keep the current list so callers see no churn
+        new_set = frozenset(seen)
+        if new_set == self._active_set:
+            return self.active_symbols
         
         self.active_symbols = new_active
-        self.last_rotation_time = time.time()
+        self._active_set = new_set
         
         return new_active
     
@@ -133,28 +210,23 @@ class SymbolManager:
     
     def get_top_momentum_symbols(self, n: int = 5) -> List[tuple]:
         """Get top N symbols by momentum score"""
-        sorted_symbols = sorted(
-            self.momentum_scores.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        return sorted_symbols[:n]
+        return [(self.symbol_pool[i], float(self._scores[i])) for i in self._top_indices(n)]
     
     def is_symbol_active(self, symbol: str) -> bool:
         """Check if symbol is currently active for trading"""
-        return symbol in self.active_symbols
+        return symbol in self._active_set
     
     def get_symbol_score(self, symbol: str) -> float:
         """Get momentum score for specific symbol"""
-        return self.momentum_scores.get(symbol, 0.0)
+        i = self._symbol_index.get(symbol)
+        return float(self._scores[i]) if i is not None else 0.0
     
     def get_rotation_status(self) -> Dict:
         """Get rotation status info"""
-        time_since_rotation = time.time() - self.last_rotation_time
-        time_until_next = max(0, self.rotation_interval - time_since_rotation)
+        time_until_next = max(0, self._next_rotation_ts - time.monotonic())
         
         return {
-            "last_rotation": datetime.fromtimestamp(self.last_rotation_time, UTC).strftime("%H:%M:%S"),
+            "last_rotation": self._last_rotation_display,
             "next_rotation_in": int(time_until_next),
             "active_count": len(self.active_symbols),
             "total_pool": len(self.symbol_pool)
@@ -3,7 +3,8 @@ Trailing Stop Module
 Manages dynamic stop loss adjustments
 """
 
-from typing import Optional
+from typing import List, Optional
+import numpy as np
 from core.models import Position
 
 
@@ -18,6 +19,10 @@ class TrailingStopManager:
         """
         self.trail_percent = trail_percent
         self.activation_profit = activation_profit
+        
+        # Stop = price * multiplier (precomputed once, used on every tick)
+        self._long_mult = 1.0 - trail_percent / 100
+        self._short_mult = 1.0 + trail_percent / 100
     
     def should_activate(self, position: Position, current_price: float) -> bool:
         """Check if trailing stop should be activated"""
@@ -40,37 +45,94 @@ class TrailingStopManager:
         Returns:
             True if stop loss was updated, False otherwise
         """
-        # Check if should activate
-        if not self.should_activate(position, current_price):
-            return False
-        
-        updated = False
-        
+        # Cheap peak comparison first - most ticks are not a new peak, and
+        # then the activation math (a division) is skipped entirely
         if position.side == "BUY":
             # For long positions, trail below the highest price
-            if position.highest_price is None or current_price > position.highest_price:
-                position.highest_price = current_price
-                new_stop = current_price * (1 - self.trail_percent / 100)
-                
-                # Only update if new stop is higher than current
-                if new_stop > position.stop_loss:
-                    position.stop_loss = new_stop
-                    position.trailing_stop_active = True
-                    updated = True
+            if position.highest_price is not None and current_price <= position.highest_price:
+                return False
+            
+            # Check activation (inlined should_activate)
+            if not position.trailing_stop_active:
+                profit_pct = ((current_price - position.entry_price) / position.entry_price) * 100
+                if profit_pct < self.activation_profit:
+                    return False
+            
+            position.highest_price = current_price
+            new_stop = current_price * self._long_mult
+            
+            # Only update if new stop is higher than current
+            if new_stop > position.stop_loss:
+                position.stop_loss = new_stop
+                position.trailing_stop_active = True
+                return True
         
         else:  # SELL
             # For short positions, trail above the lowest price
-            if position.lowest_price is None or current_price < position.lowest_price:
-                position.lowest_price = current_price
-                new_stop = current_price * (1 + self.trail_percent / 100)
-                
-                # Only update if new stop is lower than current
-                if new_stop < position.stop_loss:
-                    position.stop_loss = new_stop
-                    position.trailing_stop_active = True
-                    updated = True
-        
-        return updated
+            if position.lowest_price is not None and current_price >= position.lowest_price:
+                return False
+            
+            # Check activation (inlined should_activate)
+            if not position.trailing_stop_active:
+                profit_pct = ((position.entry_price - current_price) / position.entry_price) * 100
+                if profit_pct < self.activation_profit:
+                    return False
+            
+            position.lowest_price = current_price
+            new_stop = current_price * self._short_mult
+            
+            # Only update if new stop is lower than current
+            if new_stop < position.stop_loss:
+                position.stop_loss = new_stop
+                position.trailing_stop_active = True
+                return True
+        
+        return False
+    
+    def update_trailing_stops_batch(self, positions: List[Position], current_prices: np.ndarray) -> np.ndarray:
+        """
+        Vectorized update_trailing_stop for many positions at once
+        
+        Long and short branches are folded together with a side sign
+        (+1 BUY, -1 SELL); only the final write-back touches Position objects.
+        
+        Args:
+            positions: Positions to update
+            current_prices: Current price per position (aligned with positions)
+        
+        Returns:
+            Boolean array, True where the stop loss was updated
+        """
+        n = len(positions)
+        prices = np.asarray(current_prices, dtype=np.float64)
+        
+        sign = np.fromiter((1.0 if p.side == "BUY" else -1.0 for p in positions), dtype=np.float64, count=n)
+        entry = np.fromiter((p.entry_price for p in positions), dtype=np.float64, count=n)
+        stop = np.fromiter((p.stop_loss for p in positions), dtype=np.float64, count=n)
+        peaks = [p.highest_price if p.side == "BUY" else p.lowest_price for p in positions]
+        peak = np.array([np.nan if pk is None else pk for pk in peaks], dtype=np.float64)
+        already_active = np.fromiter((p.trailing_stop_active for p in positions), dtype=bool, count=n)
+        
+        profit_pct = sign * (prices - entry) / entry * 100
+        active = already_active | (profit_pct >= self.activation_profit)
+        
+        # New peak in the position's favour (NaN peak = never set)
+        new_peak = active & (np.isnan(peak) | (sign * (prices - peak) > 0))
+        new_stop = prices * np.where(sign > 0, self._long_mult, self._short_mult)
+        improved = new_peak & (sign * (new_stop - stop) > 0)
+        
+        for i in np.flatnonzero(new_peak).tolist():
+            position = positions[i]
+            if sign[i] > 0:
+                position.highest_price = float(prices[i])
+            else:
+                position.lowest_price = float(prices[i])
+            
+            if improved[i]:
+                position.stop_loss = float(new_stop[i])
+                position.trailing_stop_active = True
+        
+        return improved
     
     def check_stop_hit(self, position: Position, current_price: float) -> bool:
         """Check if trailing stop has been hit"""
@@ -114,37 +176,37 @@ class ATRTrailingStop:
     
     def update_trailing_stop(self, position: Position, current_price: float, atr: float) -> bool:
         """Update trailing stop based on ATR"""
-        # Calculate current profit
+        # New peak check first; activation math only runs on a new peak
         if position.side == "BUY":
+            if position.highest_price is not None and current_price <= position.highest_price:
+                return False
+            
             profit_pct = ((current_price - position.entry_price) / position.entry_price) * 100
-        else:
-            profit_pct = ((position.entry_price - current_price) / position.entry_price) * 100
-        
-        # Check activation
-        if profit_pct < self.activation_profit:
-            return False
-        
-        updated = False
-        trail_distance = atr * self.atr_multiplier
-        
-        if position.side == "BUY":
-            if position.highest_price is None or current_price > position.highest_price:
-                position.highest_price = current_price
-                new_stop = current_price - trail_distance
-                
-                if new_stop > position.stop_loss:
-                    position.stop_loss = new_stop
-                    position.trailing_stop_active = True
-                    updated = True
+            if profit_pct < self.activation_profit:
+                return False
+            
+            position.highest_price = current_price
+            new_stop = current_price - atr * self.atr_multiplier
+            
+            if new_stop > position.stop_loss:
+                position.stop_loss = new_stop
+                position.trailing_stop_active = True
+                return True
         
         else:  # SELL
-            if position.lowest_price is None or current_price < position.lowest_price:
-                position.lowest_price = current_price
-                new_stop = current_price + trail_distance
-                
-                if new_stop < position.stop_loss:
-                    position.stop_loss = new_stop
-                    position.trailing_stop_active = True
-                    updated = True
-        
-        return updated
+            if position.lowest_price is not None and current_price >= position.lowest_price:
+                return False
+            
+            profit_pct = ((position.entry_price - current_price) / position.entry_price) * 100
+            if profit_pct < self.activation_profit:
+                return False
+            
+            position.lowest_price = current_price
+            new_stop = current_price + atr * self.atr_multiplier
+            
+            if new_stop < position.stop_loss:
+                position.stop_loss = new_stop
+                position.trailing_stop_active = True
+                return True
+        
+        return False
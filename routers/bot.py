@@ -4,9 +4,12 @@ Endpoints for starting, stopping, and monitoring trading bots
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import Optional
+from sqlalchemy.orm import Session, load_only
+from typing import Optional, Dict, Tuple
+import copy
 import logging
+import time
+import yaml
 
 from database.db import get_db
 from database.models import User, BotConfig
@@ -17,6 +20,44 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/bots", tags=["Bot Control"])
 
+# Parsed active config per user, reused across start storms after disconnects
+# {user_id: (expires_at, config_dict)} - short TTL so activation changes show up quickly
+ACTIVE_CONFIG_TTL = 5.0  # seconds
+ACTIVE_CONFIG_CACHE_MAX = 1024
+_active_config_cache: Dict[int, Tuple[float, dict]] = {}
+
+# Only the columns needed to build a config dict
+_CONFIG_COLUMNS = load_only(BotConfig.id, BotConfig.name, BotConfig.config_yaml, BotConfig.updated_at)
+
+# libyaml C loader when available (pure-Python fallback otherwise)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_config_dict(config: BotConfig) -> dict:
+    """Get a fresh config dict for a BotConfig row, raising 400 on invalid YAML"""
+    try:
+        config_dict = yaml.load(config.config_yaml, Loader=_YAML_LOADER)
+        config_dict['name'] = config.name
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid YAML configuration: {str(e)}"
+        )
+    return config_dict
+
+
+def _cache_active_config(user_id: int, config_dict: dict, now: float) -> None:
+    """Store a user's parsed active config (the cached dict must not be mutated)"""
+    _active_config_cache.pop(user_id, None)
+    # One TTL for every entry, so insertion order is expiry order: drop
+    # expired entries from the front, and the oldest ones when full
+    while _active_config_cache:
+        oldest = next(iter(_active_config_cache))
+        if _active_config_cache[oldest][0] > now and len(_active_config_cache) < ACTIVE_CONFIG_CACHE_MAX:
+            break
+        del _active_config_cache[oldest]
+    _active_config_cache[user_id] = (now + ACTIVE_CONFIG_TTL, config_dict)
+
 
 @router.post("/start")
 async def start_bot(
@@ -33,7 +74,7 @@ async def start_bot(
     """
     # Get bot configuration
     if config_id:
-        config = db.query(BotConfig).filter(
+        config = db.query(BotConfig).options(_CONFIG_COLUMNS).filter(
             BotConfig.id == config_id,
             BotConfig.user_id == current_user.id
         ).first()
@@ -43,29 +84,32 @@ async def start_bot(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Configuration not found"
             )
+        
+        # Parse YAML config to dict
+        config_dict = _load_config_dict(config)
     else:
         # Use active config
-        config = db.query(BotConfig).filter(
-            BotConfig.user_id == current_user.id,
-            BotConfig.is_active == True
-        ).first()
+        now = time.monotonic()
+        cached = _active_config_cache.get(current_user.id)
         
-        if not config:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No active configuration found. Please activate a config first."
-            )
-    
-    # Parse YAML config to dict
-    import yaml
-    try:
-        config_dict = yaml.safe_load(config.config_yaml)
-        config_dict['name'] = config.name
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid YAML configuration: {str(e)}"
-        )
+        if cached and cached[0] > now:
+            config_dict = copy.deepcopy(cached[1])
+        else:
+            config = db.query(BotConfig).options(_CONFIG_COLUMNS).filter(
+                BotConfig.user_id == current_user.id,
+                BotConfig.is_active == True
+            ).first()
+            
+            if not config:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No active configuration found. Please activate a config first."
+                )
+            
+            # Parse YAML config to dict; the caller gets a copy of the cached one
+            parsed = _load_config_dict(config)
+            _cache_active_config(current_user.id, parsed, now)
+            config_dict = copy.deepcopy(parsed)
     
     # Start bot via manager
     result = await bot_manager.start_bot(
@@ -109,7 +153,7 @@ async def restart_bot(
     config_dict = None
     
     if config_id:
-        config = db.query(BotConfig).filter(
+        config = db.query(BotConfig).options(_CONFIG_COLUMNS).filter(
             BotConfig.id == config_id,
             BotConfig.user_id == current_user.id
         ).first()
@@ -120,15 +164,7 @@ async def restart_bot(
                 detail="Configuration not found"
             )
         
-        import yaml
-        try:
-            config_dict = yaml.safe_load(config.config_yaml)
-            config_dict['name'] = config.name
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid YAML configuration: {str(e)}"
-            )
+        config_dict = _load_config_dict(config)
     
     result = await bot_manager.restart_bot(
         user_id=current_user.id,
@@ -1,16 +1,25 @@
 import requests
 import json
 import os
+from datetime import datetime, UTC
+from string import Template
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # GitHub Repository Information
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN', '')  # ถ้ามี token ใน environment
 REPO_OWNER = "l3adxl3oy"
 REPO_NAME = "Binance_Bot"
-TAG_NAME = "v3.0.0"
+
+# Single source of truth - bump VERSION only
+VERSION = "3.0.0"
+_today = datetime.now(UTC)
+RELEASE_DATE = f"{_today:%B} {_today.day}, {_today.year}"
+TAG_NAME = f"v{VERSION}"
 
 # Release Information
-RELEASE_TITLE = "BinanceBot v3.0.0 - Initial Release"
-RELEASE_NOTES = """# 🚀 BinanceBot v3.0.0 - Initial Release
+RELEASE_TITLE = f"BinanceBot v{VERSION} - Initial Release"
+_RELEASE_NOTES_TEMPLATE = Template("""# 🚀 BinanceBot v$version - Initial Release
 
 ## ✨ Features
 
@@ -68,10 +77,31 @@ This release includes auto-update functionality. The bot will check for updates
 
 ---
 
-**Release Date:** February 3, 2026  
-**Version:** 3.0.0  
+**Release Date:** $date  
+**Version:** $version  
+**Repository:** https://github.com/$owner/$repo  
 **License:** See LICENSE.txt
-"""
+""")
+RELEASE_NOTES = _RELEASE_NOTES_TEMPLATE.substitute(
+    version=VERSION, date=RELEASE_DATE, owner=REPO_OWNER, repo=REPO_NAME
+)
+
+# (connect, read) timeout in seconds - never hang on a stalled GitHub API
+REQUEST_TIMEOUT = (5, 30)
+
+
+def _github_session() -> requests.Session:
+    """Session with connection pooling + retry on transient 5xx"""
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),  # a duplicate create just returns 422 already_exists
+        raise_on_status=False
+    )
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    return session
 
 def create_github_release():
     """Create GitHub Release using API"""
@@ -101,7 +131,8 @@ def create_github_release():
     print()
     
     try:
-        response = requests.post(api_url, headers=headers, json=data)
+        with _github_session() as session:
+            response = session.post(api_url, headers=headers, json=data, timeout=REQUEST_TIMEOUT)
         
         if response.status_code == 201:
             release_data = response.json()
@@ -114,7 +145,7 @@ def create_github_release():
             print("⚠️ You need to create a GitHub Personal Access Token")
             print()
             print("📋 Manual Steps:")
-            print("1. Go to: https://github.com/l3adxl3oy/Binance_Bot/releases/new")
+            print(f"1. Go to: https://github.com/{REPO_OWNER}/{REPO_NAME}/releases/new")
             print(f"2. Tag version: {TAG_NAME}")
             print(f"3. Release title: {RELEASE_TITLE}")
             print("4. Copy the release notes above")
@@ -141,7 +172,7 @@ def create_github_release():
 
 if __name__ == "__main__":
     print("="*70)
-    print("  GitHub Release Creator - BinanceBot v3.0.0")
+    print(f"  GitHub Release Creator - BinanceBot {TAG_NAME}")
     print("="*70)
     print()
     
@@ -6,7 +6,6 @@ import logging
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta, UTC
-import json
 
 # Add parent directory
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -15,6 +14,7 @@ from binance.spot import Spot
 from backtest.data_loader import HistoricalDataLoader
 from backtest.backtest_engine import BacktestEngine
 from backtest.performance_metrics import PerformanceMetrics
+from backtest.results_io import write_json, write_ndjson
 from config.config import Config
 
 # Setup logging
@@ -32,7 +32,10 @@ def run_backtest(
     end_date: datetime,
     initial_balance: float = 100.0,
     timeframe: str = '1m',
-    use_cache: bool = True
+    use_cache: bool = True,
+    parallel: bool = True,
+    fp32: bool = False,
+    http_cache: bool = True
 ):
     """
     รัน backtest หลัก
@@ -44,6 +47,10 @@ def run_backtest(
         initial_balance: Starting capital
         timeframe: Candle timeframe
         use_cache: Use cached data if available
+        parallel: Load symbols concurrently (up to 8 threads)
+        fp32: Downcast OHLCV to float32 before running the engine (opt-in;
+            float64 reproduces earlier results)
+        http_cache: Cache klines HTTP responses (requires requests-cache)
     """
     
     logger.info("="*80)
@@ -66,25 +73,34 @@ def run_backtest(
     # Step 2: Load historical data
     logger.info("\n📥 Loading historical data...")
     data_loader = HistoricalDataLoader(client=client)
+    if http_cache:
+        data_loader.enable_http_cache()
     
     historical_data = data_loader.prepare_multiple_symbols(
         symbols=symbols,
         interval=timeframe,
         start_date=start_date,
         end_date=end_date,
-        use_cache=use_cache
+        use_cache=use_cache,
+        max_workers=min(8, len(symbols)) if parallel else 1
     )
     
     if not historical_data:
         logger.error("❌ No data loaded. Exiting.")
         return
     
+    if fp32:
+        historical_data = {
+            symbol: data_loader.downcast_ohlcv(df)
+            for symbol, df in historical_data.items()
+        }
+    
     # Print data info
     logger.info(f"\n✅ Loaded data for {len(historical_data)} symbols:")
-    for symbol, df in historical_data.items():
-        info = data_loader.get_data_info(df)
-        logger.info(f"  {symbol}: {info['total_candles']} candles, "
-                   f"${info['price_range']['min']:.2f} - ${info['price_range']['max']:.2f}")
+    summary = data_loader.summarize_symbols(historical_data)
+    for row in summary.itertuples():
+        logger.info(f"  {row.Index}: {row.total_candles} candles, "
+                   f"${row.price_min:.2f} - ${row.price_max:.2f}")
     
     # Step 3: Run backtest
     logger.info("\n🚀 Running backtest...")
@@ -115,7 +131,10 @@ def run_backtest(
     # Step 6: Save results to file
     logger.info("\n💾 Saving results...")
     output_file = f"backtest/results/backtest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
+    trades_file = Path(output_file).with_suffix('.trades.ndjson')
+    
+    # Trades are streamed one per line; the JSON file keeps config + metrics
+    write_ndjson(trades_file, engine.iter_trades())
     
     save_data = {
         "config": {
@@ -126,13 +145,12 @@ def run_backtest(
             "timeframe": timeframe
         },
         "metrics": metrics,
-        "trades": results['trades']
+        "trades_file": trades_file.name
     }
     
-    with open(output_file, 'w') as f:
-        json.dump(save_data, f, indent=2, default=str)
+    write_json(output_file, save_data)
     
-    logger.info(f"✅ Results saved to: {output_file}")
+    logger.info(f"✅ Results saved to: {output_file} (trades: {trades_file})")
     
     return metrics
 
@@ -171,7 +189,8 @@ if __name__ == "__main__":
             end_date=END_DATE,
             initial_balance=INITIAL_BALANCE,
             timeframe=TIMEFRAME,
-            use_cache=True  # Set False to force re-download
+            use_cache=True,  # Set False to force re-download
+            http_cache=True  # Set False to bypass the HTTP response cache
         )
         
         logger.info("\n✅ Backtest completed successfully!")
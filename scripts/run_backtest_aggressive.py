@@ -3,21 +3,15 @@
 ทดสอบกลยุทธ์ Aggressive Recovery ด้วยข้อมูลย้อนหลัง
 """
 
+import argparse
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime, timedelta, UTC
-import json
 
 # Add parent directory
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from binance.spot import Spot
-from backtest.data_loader import HistoricalDataLoader
-from backtest.backtest_engine import BacktestEngine
-from backtest.performance_metrics import PerformanceMetrics
-from config.config import Config
-
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -33,7 +27,10 @@ def run_aggressive_backtest(
     end_date: datetime,
     initial_balance: float = 100.0,
     timeframe: str = '1m',
-    use_cache: bool = True
+    use_cache: bool = True,
+    http_cache: bool = True,
+    fp32: bool = False,
+    save_results: bool = True
 ):
     """
     รัน backtest สำหรับ Aggressive Recovery Bot
@@ -45,6 +42,10 @@ def run_aggressive_backtest(
         initial_balance: Starting capital
         timeframe: Candle timeframe
         use_cache: Use cached data if available
+        http_cache: Cache klines HTTP responses (requires requests-cache)
+        fp32: Downcast OHLCV to float32 before running the engine (opt-in;
+            float64 reproduces earlier results)
+        save_results: Write results files (False = report only)
     """
     
     logger.info("="*80)
@@ -64,6 +65,15 @@ def run_aggressive_backtest(
     logger.info(f"  Daily Target: 5% แล้วหยุดทันที!")
     logger.info("="*80)
     
+    # Heavy imports (numpy/pandas/binance) only once a backtest actually runs
+    import numpy as np
+    from binance.spot import Spot
+    from backtest.data_loader import HistoricalDataLoader
+    from backtest.backtest_engine import BacktestEngine
+    from backtest.performance_metrics import PerformanceMetrics
+    from backtest.results_io import write_json, write_ndjson
+    from config.config import Config
+    
     # Step 1: Initialize Binance client
     logger.info("\n📡 Connecting to Binance...")
     client = Spot(
@@ -75,6 +85,8 @@ def run_aggressive_backtest(
     # Step 2: Load historical data
     logger.info("\n📥 Loading historical data...")
     data_loader = HistoricalDataLoader(client=client)
+    if http_cache:
+        data_loader.enable_http_cache()
     
     historical_data = data_loader.prepare_multiple_symbols(
         symbols=symbols,
@@ -88,12 +100,18 @@ def run_aggressive_backtest(
         logger.error("❌ No data loaded. Exiting.")
         return
     
+    if fp32:
+        historical_data = {
+            symbol: data_loader.downcast_ohlcv(df)
+            for symbol, df in historical_data.items()
+        }
+    
     # Print data info
     logger.info(f"\n✅ Loaded data for {len(historical_data)} symbols:")
-    for symbol, df in historical_data.items():
-        info = data_loader.get_data_info(df)
-        logger.info(f"  {symbol}: {info['total_candles']} candles, "
-                   f"${info['price_range']['min']:.2f} - ${info['price_range']['max']:.2f}")
+    summary = data_loader.summarize_symbols(historical_data)
+    for row in summary.itertuples():
+        logger.info(f"  {row.Index}: {row.total_candles} candles, "
+                   f"${row.price_min:.2f} - ${row.price_max:.2f}")
     
     # Step 3: Run backtest with AGGRESSIVE parameters
     logger.info("\n🚀 Running AGGRESSIVE backtest...")
@@ -147,49 +165,55 @@ def run_aggressive_backtest(
     logger.info("="*80)
     PerformanceMetrics.print_summary(metrics)
     
-    # Additional aggressive-specific metrics
+    # Additional aggressive-specific metrics. The reductions are cheap, so they
+    # always run: the risk warnings must survive WARNING-level (quiet) runs,
+    # only the INFO report lines are skipped there
     if results['trades']:
-        logger.info("\n" + "="*80)
-        logger.info("⚡ AGGRESSIVE STRATEGY ANALYSIS".center(80))
-        logger.info("="*80)
-        
+        report = logger.isEnabledFor(logging.INFO)
         total_trades = len(results['trades'])
         
-        # Martingale analysis (simulated)
-        logger.info("\n🔄 Recovery System Performance:")
-        logger.info(f"  Total Trades: {total_trades}")
+        # Extract PnL once - every analysis below reuses this array
+        pnls = np.fromiter((t.get('pnl', 0.0) for t in results['trades']), dtype=np.float64, count=total_trades)
         
         # Estimate recovery scenarios based on consecutive losses
-        consecutive_losses = 0
-        max_consecutive_losses = 0
-        recovery_opportunities = 0
+        losses = pnls < 0
         
-        for trade in results['trades']:
-            if trade.get('pnl', 0) < 0:
-                consecutive_losses += 1
-                max_consecutive_losses = max(max_consecutive_losses, consecutive_losses)
-            else:
-                if consecutive_losses > 0:
-                    recovery_opportunities += 1
-                consecutive_losses = 0
+        # Losing runs: +1 / -1 edges of the padded loss mask mark run start / end
+        edges = np.diff(np.concatenate(([0], losses.view(np.int8), [0])))
+        run_lengths = np.flatnonzero(edges == -1) - np.flatnonzero(edges == 1)
+        max_consecutive_losses = int(run_lengths.max(initial=0))
+        max_drawdown_pct = metrics.get('max_drawdown_pct', 0)
         
-        logger.info(f"  Max Consecutive Losses: {max_consecutive_losses}")
-        logger.info(f"  Recovery Opportunities: {recovery_opportunities}")
+        if report:
+            logger.info("\n" + "="*80)
+            logger.info("⚡ AGGRESSIVE STRATEGY ANALYSIS".center(80))
+            logger.info("="*80)
+            
+            # A non-losing trade right after a loss ends a losing run
+            recovery_opportunities = int((~losses[1:] & losses[:-1]).sum())
+            
+            # Martingale analysis (simulated)
+            logger.info("\n🔄 Recovery System Performance:")
+            logger.info("  Total Trades: %d", total_trades)
+            logger.info("  Max Consecutive Losses: %d", max_consecutive_losses)
+            logger.info("  Recovery Opportunities: %d", recovery_opportunities)
         
         if max_consecutive_losses >= 3:
             logger.warning("  ⚠️ Warning: Reached max martingale level (3) at least once")
         
-        # Fast profit analysis
-        quick_profits = sum(1 for t in results['trades'] if t.get('pnl', 0) > 0 and t.get('pnl', 0) / initial_balance < 0.015)
-        logger.info(f"\n💨 Quick Scalps (<1.5% profit):")
-        logger.info(f"  Count: {quick_profits}/{total_trades} ({quick_profits/total_trades*100:.1f}%)")
+        if report:
+            # Fast profit analysis
+            quick_profits = int(((pnls > 0) & (pnls / initial_balance < 0.015)).sum())
+            logger.info("\n💨 Quick Scalps (<1.5% profit):")
+            logger.info("  Count: %d/%d (%.1f%%)", quick_profits, total_trades, quick_profits / total_trades * 100)
+            
+            # Risk assessment
+            logger.info("\n⚠️ Risk Assessment:")
+            logger.info("  Max Drawdown: %.2f%%", max_drawdown_pct)
         
-        # Risk assessment
-        logger.info(f"\n⚠️ Risk Assessment:")
-        logger.info(f"  Max Drawdown: {metrics.get('max_drawdown_pct', 0):.2f}%")
-        if metrics.get('max_drawdown_pct', 0) > 20:
+        if max_drawdown_pct > 20:
             logger.warning("  ⚠️ HIGH RISK: Drawdown exceeded 20%")
-        elif metrics.get('max_drawdown_pct', 0) > 15:
+        elif max_drawdown_pct > 15:
             logger.warning("  ⚠️ MODERATE RISK: Drawdown 15-20%")
         else:
             logger.info("  ✅ ACCEPTABLE: Drawdown under 15%")
@@ -197,28 +221,31 @@ def run_aggressive_backtest(
         logger.info("="*80)
     
     # Step 6: Save results
-    logger.info("\n💾 Saving results...")
-    output_file = f"backtest/results/backtest_aggressive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    
-    save_data = {
-        "bot_type": "aggressive_recovery",
-        "config": {
-            "symbols": symbols,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "initial_balance": initial_balance,
-            "timeframe": timeframe,
-            "strategy_params": aggressive_params
-        },
-        "metrics": metrics,
-        "trades": results['trades']
-    }
-    
-    with open(output_file, 'w') as f:
-        json.dump(save_data, f, indent=2, default=str)
-    
-    logger.info(f"✅ Results saved to: {output_file}")
+    if save_results:
+        logger.info("\n💾 Saving results...")
+        output_file = f"backtest/results/backtest_aggressive_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        trades_file = Path(output_file).with_suffix('.trades.ndjson')
+        
+        # Trades are streamed one per line; the JSON file keeps config + metrics
+        write_ndjson(trades_file, engine.iter_trades())
+        
+        save_data = {
+            "bot_type": "aggressive_recovery",
+            "config": {
+                "symbols": symbols,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "initial_balance": initial_balance,
+                "timeframe": timeframe,
+                "strategy_params": aggressive_params
+            },
+            "metrics": metrics,
+            "trades_file": trades_file.name
+        }
+        
+        write_json(output_file, save_data)
+        
+        logger.info(f"✅ Results saved to: {output_file} (trades: {trades_file})")
     
     # Comparison reminder
     logger.info("\n" + "="*80)
@@ -242,7 +269,7 @@ if __name__ == "__main__":
     
     # Backtest period (7 days test - same as Daily Bot for comparison)
     END_DATE = datetime.now(UTC)
-    START_DATE = END_DATE - timedelta(days=7)
+    DAYS = 7
     
     # Symbols to test (same as Daily Bot)
     SYMBOLS = [
@@ -258,6 +285,17 @@ if __name__ == "__main__":
     # Timeframe
     TIMEFRAME = '1m'  # 1-minute candles
     
+    # Command-line overrides (defaults come from the constants above)
+    parser = argparse.ArgumentParser(description="Backtest the Aggressive Recovery Bot")
+    parser.add_argument('--symbols', nargs='+', default=SYMBOLS, help="Trading pairs")
+    parser.add_argument('--days', type=int, default=DAYS, help="Days of history ending now")
+    parser.add_argument('--balance', type=float, default=INITIAL_BALANCE, help="Initial balance")
+    parser.add_argument('--dry-run', action='store_true', help="Print metrics only, do not write results")
+    parser.add_argument('--no-http-cache', action='store_true', help="Bypass the HTTP response cache")
+    parser.add_argument('--fp32', action='store_true', help="Downcast OHLCV to float32 (results differ slightly from float64)")
+    args = parser.parse_args()
+    START_DATE = END_DATE - timedelta(days=args.days)
+    
     # ==================== RUN BACKTEST ====================
     
     try:
@@ -266,12 +304,15 @@ if __name__ == "__main__":
         logger.info("📊 Results will be compared with Daily Scalping Bot\n")
         
         results = run_aggressive_backtest(
-            symbols=SYMBOLS,
+            symbols=args.symbols,
             start_date=START_DATE,
             end_date=END_DATE,
-            initial_balance=INITIAL_BALANCE,
+            initial_balance=args.balance,
             timeframe=TIMEFRAME,
-            use_cache=True  # Use cached data from previous backtest
+            use_cache=True,  # Use cached data from previous backtest
+            http_cache=not args.no_http_cache,
+            fp32=args.fp32,
+            save_results=not args.dry_run
         )
         
         logger.info("\n✅ Aggressive Bot backtest completed successfully!")
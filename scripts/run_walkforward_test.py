@@ -3,21 +3,27 @@
 วิเคราะห์ความสม่ำเสมอและ robustness ของ strategy
 """
 
+import argparse
 import logging
+import os
 import sys
 from pathlib import Path
-from datetime import datetime, timedelta, UTC
-import json
-from typing import List, Dict
+from datetime import datetime, UTC
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from multiprocessing import shared_memory
+from itertools import chain
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple
 
 # Add parent directory
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from binance.spot import Spot
-from backtest.data_loader import HistoricalDataLoader
-from backtest.backtest_engine import BacktestEngine
-from backtest.performance_metrics import PerformanceMetrics
-from config.config import Config
+# pandas / numpy / binance / backtest modules are imported where they are
+# used, so the script (and spawned workers) start without the import chain
+if TYPE_CHECKING:
+    import pandas as pd
+    from binance.spot import Spot
+    from backtest.backtest_engine import BacktestEngine
 
 # Setup logging
 logging.basicConfig(
@@ -28,26 +34,47 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def run_single_period(
-    symbols: list,
-    start_date: datetime,
-    end_date: datetime,
-    initial_balance: float = 100.0,
-    timeframe: str = '1m'
-) -> Dict:
-    """รัน backtest สำหรับ 1 period"""
+@lru_cache(maxsize=1)
+def _get_client() -> 'Spot':
+    """Binance client shared by every load in this process (keeps HTTP connections alive)"""
+    from binance.spot import Spot
+    from config.config import Config
     
-    logger.info(f"📅 Testing period: {start_date.date()} to {end_date.date()}")
-    
-    # Initialize client
-    client = Spot(
+    return Spot(
         api_key=Config.API_KEY,
         api_secret=Config.API_SECRET,
         base_url=Config.BASE_URL
     )
+
+
+@lru_cache(maxsize=1)
+def _get_engine() -> 'BacktestEngine':
+    """One engine per process, reset before each period instead of rebuilt"""
+    from backtest.backtest_engine import BacktestEngine
     
-    # Load data
-    data_loader = HistoricalDataLoader(client=client)
+    return BacktestEngine(
+        initial_balance=100.0,
+        commission_rate=0.001,
+        slippage_pct=0.0005,
+        max_positions=3,
+        position_size_pct=0.33
+    )
+
+
+def _load_data(
+    symbols: list,
+    start_date: datetime,
+    end_date: datetime,
+    timeframe: str = '1m',
+    http_cache: bool = True,
+    fp32: bool = False
+) -> Dict[str, 'pd.DataFrame']:
+    """โหลดข้อมูลหลายคู่เทรดสำหรับช่วงเวลาที่กำหนด"""
+    from backtest.data_loader import HistoricalDataLoader
+    
+    data_loader = HistoricalDataLoader(client=_get_client())
+    if http_cache:
+        data_loader.enable_http_cache()
     historical_data = data_loader.prepare_multiple_symbols(
         symbols=symbols,
         interval=timeframe,
@@ -56,29 +83,151 @@ def run_single_period(
         use_cache=True
     )
     
+    if fp32:
+        historical_data = {
+            symbol: data_loader.downcast_ohlcv(df)
+            for symbol, df in historical_data.items()
+        }
+    return historical_data
+
+
+def _naive_utc(dt: datetime) -> 'pd.Timestamp':
+    """Candle timestamps are naive UTC - drop tzinfo for comparisons"""
+    import pandas as pd
+    
+    ts = dt if isinstance(dt, pd.Timestamp) else pd.Timestamp(dt)
+    return ts.tz_convert(None) if ts.tzinfo is not None else ts
+
+
+def _share_frames(
+    data: Dict[str, 'pd.DataFrame']
+) -> Tuple[Dict[str, Tuple], List[shared_memory.SharedMemory]]:
+    """
+    Copy each symbol's timestamps + OHLCV into shared memory (parent side)
+    
+    Workers attach by name instead of receiving pickled DataFrames.
+    
+    Returns:
+        (blocks, handles) - blocks maps symbol -> (ts_name, ohlcv_name,
+        rows, ts_dtype, ohlcv_dtype) for workers; the parent must
+        close/unlink handles
+    """
+    import numpy as np
+    from backtest.data_loader import OHLCV_COLUMNS
+    
+    blocks = {}
+    handles = []
+    for symbol, df in data.items():
+        timestamps = df['timestamp'].to_numpy()
+        ohlcv = np.ascontiguousarray(df[OHLCV_COLUMNS].to_numpy())
+        
+        ts_shm = shared_memory.SharedMemory(create=True, size=max(timestamps.nbytes, 1))
+        handles.append(ts_shm)
+        ohlcv_shm = shared_memory.SharedMemory(create=True, size=max(ohlcv.nbytes, 1))
+        handles.append(ohlcv_shm)
+        
+        np.ndarray(timestamps.shape, dtype=timestamps.dtype, buffer=ts_shm.buf)[:] = timestamps
+        np.ndarray(ohlcv.shape, dtype=ohlcv.dtype, buffer=ohlcv_shm.buf)[:] = ohlcv
+        blocks[symbol] = (ts_shm.name, ohlcv_shm.name, len(timestamps), timestamps.dtype.str, ohlcv.dtype.str)
+    
+    return blocks, handles
+
+
+def _attach_period(
+    blocks: Dict[str, Tuple],
+    start_date: datetime,
+    end_date: datetime
+) -> Dict[str, 'pd.DataFrame']:
+    """Attach to shared OHLCV blocks (worker side) and copy out one period"""
+    import numpy as np
+    import pandas as pd
+    from backtest.data_loader import OHLCV_COLUMNS
+    
+    start_ts = _naive_utc(start_date).to_datetime64()
+    end_ts = _naive_utc(end_date).to_datetime64()
+    
+    sliced = {}
+    for symbol, (ts_name, ohlcv_name, rows, ts_dtype, ohlcv_dtype) in blocks.items():
+        ts_shm = shared_memory.SharedMemory(name=ts_name)
+        ohlcv_shm = shared_memory.SharedMemory(name=ohlcv_name)
+        try:
+            timestamps = np.ndarray((rows,), dtype=np.dtype(ts_dtype), buffer=ts_shm.buf)
+            ohlcv = np.ndarray((rows, len(OHLCV_COLUMNS)), dtype=np.dtype(ohlcv_dtype), buffer=ohlcv_shm.buf)
+            
+            lo = timestamps.searchsorted(start_ts, side='left')
+            hi = timestamps.searchsorted(end_ts, side='right')
+            if hi > lo:
+                # Copy the period out so nothing references the buffers after close
+                df = pd.DataFrame(ohlcv[lo:hi].copy(), columns=OHLCV_COLUMNS)
+                df.insert(0, 'timestamp', timestamps[lo:hi].copy())
+                sliced[symbol] = df
+            del timestamps, ohlcv
+        finally:
+            ts_shm.close()
+            ohlcv_shm.close()
+    return sliced
+
+
+def run_single_period_shared(
+    blocks: Dict[str, Tuple],
+    start_date: datetime,
+    end_date: datetime,
+    initial_balance: float = 100.0
+) -> Dict:
+    """รัน backtest 1 period จากข้อมูลใน shared memory (ใช้ใน worker process)"""
+    historical_data = _attach_period(blocks, start_date, end_date)
+    return run_single_period_on_data(historical_data, start_date, end_date, initial_balance)
+
+
+def slice_period(
+    data: Dict[str, 'pd.DataFrame'],
+    start_date: datetime,
+    end_date: datetime
+) -> Dict[str, 'pd.DataFrame']:
+    """
+    ตัดข้อมูลเฉพาะช่วง period จากข้อมูลชุดใหญ่ (ไม่โหลดใหม่)
+    
+    Candle timestamps are naive UTC and sorted, so each bound is a binary
+    search and the slice is positional.
+    """
+    start_ts = _naive_utc(start_date)
+    end_ts = _naive_utc(end_date)
+    
+    sliced = {}
+    for symbol, df in data.items():
+        timestamps = df['timestamp']
+        lo = timestamps.searchsorted(start_ts, side='left')
+        hi = timestamps.searchsorted(end_ts, side='right')
+        if hi > lo:
+            sliced[symbol] = df.iloc[lo:hi].reset_index(drop=True)
+    return sliced
+
+
+def run_single_period_on_data(
+    historical_data: Dict[str, 'pd.DataFrame'],
+    start_date: datetime,
+    end_date: datetime,
+    initial_balance: float = 100.0
+) -> Dict:
+    """รัน backtest สำหรับ 1 period บนข้อมูลที่โหลดไว้แล้ว"""
+    
+    logger.info(f"📅 Testing period: {start_date.date()} to {end_date.date()}")
+    
     if not historical_data:
         logger.error("❌ No data loaded")
         return None
     
-    # Run backtest
-    engine = BacktestEngine(
-        initial_balance=initial_balance,
-        commission_rate=0.001,
-        slippage_pct=0.0005,
-        max_positions=3,
-        position_size_pct=0.33
-    )
+    # Run backtest (reuse this process's engine)
+    engine = _get_engine()
+    engine.reset(initial_balance=initial_balance)
     
     results = engine.run_backtest(
         data=historical_data,
         strategy_params=None
     )
     
-    # Calculate metrics
-    metrics = PerformanceMetrics.calculate_metrics(
-        trades=results['trades'],
-        initial_balance=initial_balance
-    )
+    # Headline metrics are tracked by the engine while trades close
+    metrics = results['metrics']
     
     return {
         'start_date': start_date.isoformat(),
@@ -88,11 +237,27 @@ def run_single_period(
     }
 
 
+def run_single_period(
+    symbols: list,
+    start_date: datetime,
+    end_date: datetime,
+    initial_balance: float = 100.0,
+    timeframe: str = '1m'
+) -> Dict:
+    """รัน backtest สำหรับ 1 period (โหลดข้อมูลของ period นั้นเอง)"""
+    historical_data = _load_data(symbols, start_date, end_date, timeframe)
+    return run_single_period_on_data(historical_data, start_date, end_date, initial_balance)
+
+
 def run_walk_forward_test(
     symbols: list,
     period_days: int = 7,
     num_periods: int = 4,
-    initial_balance: float = 100.0
+    initial_balance: float = 100.0,
+    max_workers: Optional[int] = None,
+    http_cache: bool = True,
+    fp32: bool = False,
+    save_results: bool = True
 ):
     """
     รัน Walk-Forward Test หลาย periods
@@ -102,6 +267,12 @@ def run_walk_forward_test(
         period_days: จำนวนวันต่อ period
         num_periods: จำนวน periods ที่จะทดสอบ
         initial_balance: เงินทุนเริ่มต้น
+        max_workers: Processes to run periods on (default: one per period,
+            capped at CPU count; 1 = sequential)
+        http_cache: Cache klines HTTP responses (requires requests-cache)
+        fp32: Downcast OHLCV to float32 (halves the data shared with workers;
+            opt-in, float64 reproduces earlier results)
+        save_results: Write the JSON Lines results file (False = report only)
     """
     
     logger.info("="*80)
@@ -113,25 +284,70 @@ def run_walk_forward_test(
     logger.info(f"🔢 Number of Periods: {num_periods}")
     logger.info("="*80)
     
+    import pandas as pd
+    
     end_date = datetime.now(UTC)
-    all_results = []
     
-    # รันแต่ละ period
+    # Periods are independent - build every boundary once as a tz-aware
+    # Timestamp (newest period first); downstream code reuses them as-is
+    bounds = pd.date_range(end=end_date, periods=num_periods + 1, freq=f'{period_days}D')
+    periods = [(bounds[-(i + 2)], bounds[-(i + 1)]) for i in range(num_periods)]
+    
+    if max_workers is None:
+        max_workers = min(num_periods, os.cpu_count() or 1)
+    
+    # Periods are contiguous - fetch the whole span once and slice per period
+    logger.info("\n📥 Loading historical data for all periods...")
+    full_data = _load_data(
+        symbols,
+        bounds[0],
+        bounds[-1],
+        http_cache=http_cache,
+        fp32=fp32
+    )
+    
+    # รันแต่ละ period (แยก process ละ period - backtest เป็นงาน CPU-bound)
+    results_by_period = {}
+    if max_workers > 1 and num_periods > 1:
+        # Workers attach to one shared copy of the data instead of each
+        # receiving a pickled DataFrame per period
+        blocks, handles = _share_frames(full_data)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        run_single_period_shared,
+                        blocks=blocks,
+                        start_date=period_start,
+                        end_date=period_end,
+                        initial_balance=initial_balance
+                    ): i
+                    for i, (period_start, period_end) in enumerate(periods)
+                }
+                for done, future in enumerate(as_completed(futures), 1):
+                    i = futures[future]
+                    results_by_period[i] = future.result()
+                    logger.info(f"🔄 Period {i+1}/{num_periods} finished ({done}/{num_periods} done)")
+        finally:
+            for shm in handles:
+                shm.close()
+                shm.unlink()
+    else:
+        for i, (period_start, period_end) in enumerate(periods):
+            logger.info(f"\n{'='*80}")
+            logger.info(f"🔄 Period {i+1}/{num_periods}")
+            logger.info(f"{'='*80}")
+            
+            results_by_period[i] = run_single_period_on_data(
+                historical_data=slice_period(full_data, period_start, period_end),
+                start_date=period_start,
+                end_date=period_end,
+                initial_balance=initial_balance
+            )
+    
+    all_results = []
     for i in range(num_periods):
-        period_end = end_date - timedelta(days=i * period_days)
-        period_start = period_end - timedelta(days=period_days)
-        
-        logger.info(f"\n{'='*80}")
-        logger.info(f"🔄 Period {i+1}/{num_periods}")
-        logger.info(f"{'='*80}")
-        
-        result = run_single_period(
-            symbols=symbols,
-            start_date=period_start,
-            end_date=period_end,
-            initial_balance=initial_balance
-        )
-        
+        result = results_by_period.get(i)
         if result:
             all_results.append(result)
             
@@ -150,34 +366,40 @@ def run_walk_forward_test(
     logger.info(f"{'='*80}")
     
     if all_results:
-        returns = [r['metrics']['total_return_pct'] for r in all_results]
-        win_rates = [r['metrics']['win_rate'] for r in all_results]
-        profit_factors = [r['metrics']['profit_factor'] for r in all_results]
-        max_dds = [r['metrics']['max_drawdown_pct'] for r in all_results]
+        import numpy as np
+        from backtest.stats_nb import summarize
+        
+        returns = np.asarray([r['metrics']['total_return_pct'] for r in all_results], dtype=float)
+        win_rates = np.asarray([r['metrics']['win_rate'] for r in all_results], dtype=float)
+        profit_factors = np.asarray([r['metrics']['profit_factor'] for r in all_results], dtype=float)
+        max_dds = np.asarray([r['metrics']['max_drawdown_pct'] for r in all_results], dtype=float)
+        
+        # One fused pass for mean/std/min/max/positive count
+        return_stats = summarize(returns)
         
         logger.info(f"\n📈 Return Statistics:")
-        logger.info(f"  Average: {sum(returns)/len(returns):+.2f}%")
-        logger.info(f"  Best: {max(returns):+.2f}%")
-        logger.info(f"  Worst: {min(returns):+.2f}%")
-        logger.info(f"  Std Dev: {(sum((x - sum(returns)/len(returns))**2 for x in returns) / len(returns))**0.5:.2f}%")
+        logger.info(f"  Average: {return_stats.mean:+.2f}%")
+        logger.info(f"  Best: {return_stats.max:+.2f}%")
+        logger.info(f"  Worst: {return_stats.min:+.2f}%")
+        logger.info(f"  Std Dev: {return_stats.std:.2f}%")
         
         logger.info(f"\n🎯 Win Rate Statistics:")
-        logger.info(f"  Average: {sum(win_rates)/len(win_rates):.1f}%")
-        logger.info(f"  Best: {max(win_rates):.1f}%")
-        logger.info(f"  Worst: {min(win_rates):.1f}%")
+        logger.info(f"  Average: {win_rates.mean():.1f}%")
+        logger.info(f"  Best: {win_rates.max():.1f}%")
+        logger.info(f"  Worst: {win_rates.min():.1f}%")
         
         logger.info(f"\n💪 Profit Factor Statistics:")
-        logger.info(f"  Average: {sum(profit_factors)/len(profit_factors):.2f}")
-        logger.info(f"  Best: {max(profit_factors):.2f}")
-        logger.info(f"  Worst: {min(profit_factors):.2f}")
+        logger.info(f"  Average: {profit_factors.mean():.2f}")
+        logger.info(f"  Best: {profit_factors.max():.2f}")
+        logger.info(f"  Worst: {profit_factors.min():.2f}")
         
         logger.info(f"\n🛡️ Max Drawdown Statistics:")
-        logger.info(f"  Average: {sum(max_dds)/len(max_dds):.2f}%")
-        logger.info(f"  Best (smallest): {max(max_dds):.2f}%")
-        logger.info(f"  Worst (largest): {min(max_dds):.2f}%")
+        logger.info(f"  Average: {max_dds.mean():.2f}%")
+        logger.info(f"  Best (smallest): {max_dds.max():.2f}%")
+        logger.info(f"  Worst (largest): {max_dds.min():.2f}%")
         
         # Consistency check
-        positive_periods = sum(1 for r in returns if r > 0)
+        positive_periods = return_stats.positive
         consistency = (positive_periods / len(returns)) * 100
         
         logger.info(f"\n✅ Consistency:")
@@ -192,23 +414,25 @@ def run_walk_forward_test(
         else:
             logger.info(f"  ❌ Poor consistency - strategy may not be robust")
     
-    # บันทึกผลลัพธ์
-    output_file = f"backtest/results/walkforward_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    Path(output_file).parent.mkdir(parents=True, exist_ok=True)
-    
-    with open(output_file, 'w') as f:
-        json.dump({
+    # บันทึกผลลัพธ์ (JSON Lines: header 1 บรรทัด + 1 บรรทัดต่อ period)
+    if save_results:
+        from backtest.results_io import write_ndjson
+        
+        output_file = f"backtest/results/walkforward_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl"
+        
+        header = {
+            'type': 'header',
             'test_date': datetime.now(UTC).isoformat(),
             'config': {
                 'symbols': symbols,
                 'period_days': period_days,
                 'num_periods': num_periods,
                 'initial_balance': initial_balance
-            },
-            'results': all_results
-        }, f, indent=2, default=str)
-    
-    logger.info(f"\n💾 Results saved to: {output_file}")
+            }
+        }
+        write_ndjson(output_file, chain([header], ({'type': 'period', **r} for r in all_results)))
+        
+        logger.info(f"\n💾 Results saved to: {output_file}")
     logger.info(f"\n{'='*80}")
     
     return all_results
@@ -230,14 +454,30 @@ if __name__ == "__main__":
     NUM_PERIODS = 4      # ทดสอบ 4 periods (28 วันรวม)
     INITIAL_BALANCE = 100.0
     
+    # Command-line overrides (defaults come from the constants above)
+    parser = argparse.ArgumentParser(description="Walk-forward backtest over consecutive periods")
+    parser.add_argument('--symbols', nargs='+', default=SYMBOLS, help="Trading pairs")
+    parser.add_argument('--period-days', type=int, default=PERIOD_DAYS, help="Days per period")
+    parser.add_argument('--num-periods', type=int, default=NUM_PERIODS, help="Number of periods")
+    parser.add_argument('--balance', type=float, default=INITIAL_BALANCE, help="Initial balance")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (1 = sequential)")
+    parser.add_argument('--dry-run', action='store_true', help="Print metrics only, do not write results")
+    parser.add_argument('--no-http-cache', action='store_true', help="Bypass the HTTP response cache")
+    parser.add_argument('--fp32', action='store_true', help="Downcast OHLCV to float32 (results differ slightly from float64)")
+    args = parser.parse_args()
+    
     # ==================== RUN TEST ====================
     
     try:
         results = run_walk_forward_test(
-            symbols=SYMBOLS,
-            period_days=PERIOD_DAYS,
-            num_periods=NUM_PERIODS,
-            initial_balance=INITIAL_BALANCE
+            symbols=args.symbols,
+            period_days=args.period_days,
+            num_periods=args.num_periods,
+            initial_balance=args.balance,
+            max_workers=args.workers,
+            http_cache=not args.no_http_cache,
+            fp32=args.fp32,
+            save_results=not args.dry_run
         )
         
         logger.info("\n✅ Walk-Forward Test completed successfully!")
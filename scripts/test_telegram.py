@@ -9,6 +9,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config.config import Config
+from utils.telegram_session import get_telegram_session
 import requests
 
 def test_telegram():
@@ -75,7 +76,7 @@ def test_telegram():
             "parse_mode": "HTML"
         }
         
-        response = requests.post(url, data=data, timeout=10)
+        response = get_telegram_session().post(url, data=data, timeout=10)
         
         if response.status_code == 200:
             result = response.json()
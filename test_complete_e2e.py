@@ -2,12 +2,36 @@
 Complete E2E Testing - Using FastAPI TestClient
 ทดสอบครบทุก endpoint แบบไม่ต้องรัน server จริง
 """
+import io
+import json
 import os
 import sys
 import time
 
+# orjson is optional - decodes bodies straight from bytes, faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
+
+# Banner/summary lines are collected here and written in one call per
+# section (each print is an encode + write on a Windows console);
+# per-test result lines are still printed immediately
+_buf = io.StringIO()
+
+def p(*args, **kwargs):
+    print(*args, file=_buf, **kwargs)
+
+def _flush():
+    sys.stdout.write(_buf.getvalue())
+    sys.stdout.flush()
+    _buf.seek(0)
+    _buf.truncate(0)
+
 os.environ['DATABASE_URL'] = 'sqlite:///./test_complete_e2e.db'
 
 from fastapi.testclient import TestClient
@@ -26,25 +50,44 @@ print("[OK] Database initialized")
 print("[INIT] Loading application...")
 from app import app
 client = TestClient(app)
+# Common headers set once on the client instead of merged per call
+client.headers.update({'accept': 'application/json', 'user-agent': 'e2e'})
 print("[OK] Application loaded successfully")
 
 # Test counters
 passed = 0
 failed = 0
 total = 0
+skipped = 0
+
+# Prerequisite groups ("token", "config") whose producing test failed -
+# dependents are skipped instead of firing requests that cannot pass
+failed_groups = set()
 
-def test_endpoint(name, method, url, expected_status=200, **kwargs):
-    global passed, failed, total
+def _json(response):
+    """Decode a response body (orjson straight from bytes when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _dumps(payload) -> bytes:
+    """Serialize a request body once so it can be re-sent as-is"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode()
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def test_endpoint(name, method, url, expected_status=200, requires=None, provides=None, **kwargs):
+    global passed, failed, skipped, total
     total += 1
+    if requires in failed_groups:
+        print(f"[SKIP] {name}: requires {requires}")
+        skipped += 1
+        return None
+    
     try:
-        if method == 'GET':
-            response = client.get(url, **kwargs)
-        elif method == 'POST':
-            response = client.post(url, **kwargs)
-        elif method == 'PUT':
-            response = client.put(url, **kwargs)
-        elif method == 'DELETE':
-            response = client.delete(url, **kwargs)
+        response = getattr(client, method.lower())(url, **kwargs)
         
         if response.status_code == expected_status:
             print(f"[OK] {name}")
@@ -55,19 +98,22 @@ def test_endpoint(name, method, url, expected_status=200, **kwargs):
             if response.status_code != expected_status:
                 print(f"       Response: {response.text[:100]}")
             failed += 1
-            return None
     except Exception as e:
         print(f"[ERROR] {name}: {str(e)[:100]}")
         failed += 1
-        return None
+    
+    if provides:
+        failed_groups.add(provides)
+    return None
 
 # =================================================================
 # Test Suite
 # =================================================================
 
-print("\n" + "-" * 70)
-print("Category 1: Public Endpoints (No Auth)")
-print("-" * 70)
+p("\n" + "-" * 70)
+p("Category 1: Public Endpoints (No Auth)")
+p("-" * 70)
+_flush()
 
 # Test 1: Health Check
 test_endpoint("Health Check", "GET", "/api/health", 200)
@@ -78,15 +124,16 @@ test_endpoint("System Stats", "GET", "/api/stats", 200)
 # Test 3: OpenAPI Schema
 response = test_endpoint("OpenAPI Schema", "GET", "/openapi.json", 200)
 if response:
-    schema = response.json()
+    schema = _json(response)
     print(f"       Found {len(schema.get('paths', {}))} endpoints in schema")
 
 # Test 4: API Docs
 test_endpoint("API Documentation", "GET", "/docs", 200)
 
-print("\n" + "-" * 70)
-print("Category 2: Authentication")
-print("-" * 70)
+p("\n" + "-" * 70)
+p("Category 2: Authentication")
+p("-" * 70)
+_flush()
 
 # Test 5: User Signup
 timestamp = int(time.time())
@@ -95,25 +142,27 @@ signup_data = {
     "email": f"test_{timestamp}@example.com",
     "password": "SecurePassword123!"
 }
+# Sent twice (Test 5 and the duplicate signup in Test 20)
+signup_body = _dumps(signup_data)
 
 response = test_endpoint(
     "User Signup",
     "POST",
     "/auth/signup",
     201,
-    json=signup_data
+    content=signup_body,
+    headers=JSON_HEADERS,
+    provides="token"
 )
 
+token = None
 if response:
-    result = response.json()
+    result = _json(response)
     token = result.get('access_token')
     user_info = result.get('user', {})
     print(f"       User: {user_info.get('username')}")
     print(f"       Email: {user_info.get('email')}")
     print(f"       Token: {token[:30]}...")
-else:
-    print("[ERROR] Cannot continue without token")
-    sys.exit(1)
 
 # Headers for authenticated requests
 headers = {"Authorization": f"Bearer {token}"}
@@ -129,7 +178,8 @@ response = test_endpoint(
     "POST",
     "/auth/login",
     200,
-    data=login_data
+    data=login_data,
+    requires="token"
 )
 
 # Test 7: Get User Profile
@@ -138,10 +188,11 @@ response = test_endpoint(
     "GET",
     "/auth/me",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 if response:
-    user = response.json()
+    user = _json(response)
     print(f"       ID: {user.get('id')}, Active: {user.get('is_active')}")
 
 # Test 8: Update API Keys
@@ -156,12 +207,14 @@ response = test_endpoint(
     "/auth/api-keys",
     200,
     json=api_keys_data,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
-print("\n" + "-" * 70)
-print("Category 3: Configuration Management")
-print("-" * 70)
+p("\n" + "-" * 70)
+p("Category 3: Configuration Management")
+p("-" * 70)
+_flush()
 
 # Test 9: Get Config Templates
 response = test_endpoint(
@@ -169,10 +222,11 @@ response = test_endpoint(
     "GET",
     "/configs/templates",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 if response:
-    templates = response.json()
+    templates = _json(response)
     print(f"       Found {len(templates)} templates")
 
 # Test 10: Get Specific Template
@@ -181,7 +235,8 @@ test_endpoint(
     "GET",
     "/configs/templates/aggressive_recovery",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
 # Test 11: Create Bot Config
@@ -205,12 +260,14 @@ response = test_endpoint(
     "/configs/create",
     201,
     json=config_data,
-    headers=headers
+    headers=headers,
+    requires="token",
+    provides="config"
 )
 
 config_id = None
 if response:
-    config = response.json()
+    config = _json(response)
     config_id = config.get('id')
     print(f"       Config ID: {config_id}")
 
@@ -220,10 +277,11 @@ response = test_endpoint(
     "GET",
     "/configs/my-configs",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 if response:
-    configs = response.json()
+    configs = _json(response)
     print(f"       Found {len(configs)} user configs")
 
 # Test 13: Validate Config
@@ -237,32 +295,34 @@ test_endpoint(
     "/configs/validate",
     200,
     json=validate_data,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
 # Test 14: Activate Config (if created)
-if config_id:
-    test_endpoint(
-        "Activate Config",
-        "POST",
-        f"/configs/activate/{config_id}",
-        200,
-        headers=headers
-    )
+test_endpoint(
+    "Activate Config",
+    "POST",
+    f"/configs/activate/{config_id}",
+    200,
+    headers=headers,
+    requires="config"
+)
 
 # Test 15: Get Specific Config
-if config_id:
-    response = test_endpoint(
-        "Get Config by ID",
-        "GET",
-        f"/configs/my-configs/{config_id}",
-        200,
-        headers=headers
-    )
-
-print("\n" + "-" * 70)
-print("Category 4: Bot Management")
-print("-" * 70)
+response = test_endpoint(
+    "Get Config by ID",
+    "GET",
+    f"/configs/my-configs/{config_id}",
+    200,
+    headers=headers,
+    requires="config"
+)
+
+p("\n" + "-" * 70)
+p("Category 4: Bot Management")
+p("-" * 70)
+_flush()
 
 # Test 16: Get Bot Status
 response = test_endpoint(
@@ -270,10 +330,11 @@ response = test_endpoint(
     "GET",
     "/bots/status",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 if response:
-    status = response.json()
+    status = _json(response)
     print(f"       Status: {status.get('status')}, Running: {status.get('running')}")
 
 # Test 17: Get Bot Logs
@@ -282,10 +343,11 @@ response = test_endpoint(
     "GET",
     "/bots/logs",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 if response:
-    logs = response.json()
+    logs = _json(response)
     print(f"       Found {len(logs.get('logs', []))} log entries")
 
 # Test 18: Get Performance Metrics
@@ -294,7 +356,8 @@ test_endpoint(
     "GET",
     "/bots/performance",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
 # Test 19: Start Bot (will fail without proper config, but test endpoint exists)
@@ -308,14 +371,16 @@ response = test_endpoint(
     "/bots/start",
     expected_status=400,  # Expected to fail without proper Binance config
     json=start_data,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 if response:
     print(f"       Expected failure (no Binance API keys configured)")
 
-print("\n" + "-" * 70)
-print("Category 5: Authentication Edge Cases")
-print("-" * 70)
+p("\n" + "-" * 70)
+p("Category 5: Authentication Edge Cases")
+p("-" * 70)
+_flush()
 
 # Test 20: Duplicate Signup (should fail)
 test_endpoint(
@@ -323,7 +388,9 @@ test_endpoint(
     "POST",
     "/auth/signup",
     400,
-    json=signup_data
+    content=signup_body,
+    headers=JSON_HEADERS,
+    requires="token"
 )
 
 # Test 21: Wrong Password Login
@@ -337,7 +404,8 @@ test_endpoint(
     "POST",
     "/auth/login",
     401,
-    data=wrong_login
+    data=wrong_login,
+    requires="token"
 )
 
 # Test 22: Access Protected Endpoint without Token
@@ -354,12 +422,14 @@ test_endpoint(
     "POST",
     "/auth/logout",
     200,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
-print("\n" + "-" * 70)
-print("Category 6: Error Handling")
-print("-" * 70)
+p("\n" + "-" * 70)
+p("Category 6: Error Handling")
+p("-" * 70)
+_flush()
 
 # Test 24: Invalid Config ID
 test_endpoint(
@@ -367,7 +437,8 @@ test_endpoint(
     "GET",
     "/configs/my-configs/99999",
     404,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
 # Test 25: Invalid Template Name
@@ -376,7 +447,8 @@ test_endpoint(
     "GET",
     "/configs/templates/invalid_template",
     404,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
 # Test 26: Activate Non-existent Config
@@ -385,35 +457,38 @@ test_endpoint(
     "POST",
     "/configs/activate/99999",
     404,
-    headers=headers
+    headers=headers,
+    requires="token"
 )
 
 # =================================================================
 # Summary
 # =================================================================
 
-print("\n" + "=" * 70)
-print("    Test Summary")
-print("=" * 70)
-print(f"Total Tests: {total}")
-print(f"Passed:      {passed} ({passed*100//total if total > 0 else 0}%)")
-print(f"Failed:      {failed}")
-print("=" * 70)
+p("\n" + "=" * 70)
+p("    Test Summary")
+p("=" * 70)
+p(f"Total Tests: {total}")
+p(f"Passed:      {passed} ({passed*100//total if total > 0 else 0}%)")
+p(f"Failed:      {failed}")
+p(f"Skipped:     {skipped}")
+p("=" * 70)
 
 if failed == 0:
-    print("\n[SUCCESS] All tests passed! ✅")
-    print("\nWeb Application Status:")
-    print("  ✅ All endpoints working correctly")
-    print("  ✅ Authentication system functional")
-    print("  ✅ Config management operational")
-    print("  ✅ Bot control endpoints ready")
-    print("  ✅ Error handling proper")
-    print("\n🎉 APPLICATION IS FULLY FUNCTIONAL! 🎉")
+    p("\n[SUCCESS] All tests passed! ✅")
+    p("\nWeb Application Status:")
+    p("  ✅ All endpoints working correctly")
+    p("  ✅ Authentication system functional")
+    p("  ✅ Config management operational")
+    p("  ✅ Bot control endpoints ready")
+    p("  ✅ Error handling proper")
+    p("\n🎉 APPLICATION IS FULLY FUNCTIONAL! 🎉")
 else:
-    print(f"\n[WARNING] {failed} tests failed")
-    print("Review the failed tests above for details")
+    p(f"\n[WARNING] {failed} tests failed")
+    p("Review the failed tests above for details")
 
-print("=" * 70)
+p("=" * 70)
+_flush()
 
 # Exit with appropriate code
 sys.exit(0 if failed == 0 else 1)
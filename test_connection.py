@@ -1,6 +1,5 @@
 """Test Binance API Connection"""
 from config.config import Config
-from binance.spot import Spot
 
 try:
     print("🔄 กำลังเชื่อมต่อ Binance Testnet...")
@@ -8,35 +7,43 @@ try:
     print(f"🔑 API Key: {Config.API_KEY[:10]}...{Config.API_KEY[-10:]}")
     print()
     
+    # Imported only after the config checks above - a bad .env fails fast
+    # without paying for binance's requests/urllib3/crypto imports
+    from binance.spot import Spot
+    from requests.adapters import HTTPAdapter
+    
     client = Spot(
         api_key=Config.API_KEY,
         api_secret=Config.API_SECRET,
-        base_url=Config.BASE_URL
+        base_url=Config.BASE_URL,
+        timeout=10
     )
+    # Spot keeps one requests.Session (with this key's headers) per client:
+    # reuse the client, and its pooled keep-alive connection, for every call
+    client.session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=10))
+    
+    # Unsigned ping first: fail fast on network/URL problems before the
+    # signed account call
+    client.ping()
     
-    account = client.account()
+    # Server drops zero rows (a testnet account lists thousands of assets)
+    account = client.account(omitZeroBalances=True)
     
     print("✅ เชื่อมต่อสำเร็จ!")
     print("="*50)
     print("💰 ยอดเงินใน Spot Wallet:")
     print("="*50)
     
-    total_usdt = 0
-    has_balance = False
-    
-    for asset in account['balances']:
-        free = float(asset['free'])
-        locked = float(asset['locked'])
-        total = free + locked
-        
-        if total > 0:
-            has_balance = True
-            print(f"  {asset['asset']:10s}: {free:15,.2f} (locked: {locked:,.2f})")
-            
-            if asset['asset'] == 'USDT':
-                total_usdt = total
-    
-    if not has_balance:
+    # Parse each row once: (asset, free, locked) for non-zero balances only
+    parsed = ((a['asset'], float(a['free']), float(a['locked'])) for a in account['balances'])
+    balances = [row for row in parsed if row[1] + row[2] > 0]
+    
+    for name, free, locked in balances:
+        print(f"  {name:10s}: {free:15,.2f} (locked: {locked:,.2f})")
+    
+    total_usdt = next((free + locked for name, free, locked in balances if name == 'USDT'), 0)
+    
+    if not balances:
         print("  ⚠️ ไม่มียอดเงินในบัญชี")
         print("  💡 ไปที่ https://testnet.binance.vision/ เพื่อเติมเงินทดสอบ")
     else:
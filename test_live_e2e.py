@@ -2,131 +2,188 @@
 E2E Testing Script - Live Server Testing
 ทดสอบ API endpoints จริงๆ กับ running server
 """
-import requests
+import asyncio
+import httpx
+import os
+from itertools import islice
 import time
 import json
 import sys
 
+# orjson is optional - decodes bodies straight from bytes, faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# HTTP/2 needs the h2 extra (pip install httpx[http2]); without it stay on HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
 
-BASE_URL = "http://127.0.0.1:8000"
+BASE_URL = "http://127.0.0.1:8000"  # HTTP/2 is only negotiated (ALPN) on https:// URLs
+
+# Default: call the ASGI app in-process (no server, no sockets).
+# E2E_LIVE=1 hits a real uvicorn on BASE_URL over the network instead.
+E2E_LIVE = os.getenv("E2E_LIVE") == "1"
+
+# In-process runs sign up users and create configs - keep them off the
+# configured DATABASE_URL (dev trading_bot.db or production Postgres).
+# Must be set before database.db is imported
+if not E2E_LIVE:
+    os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+
+# Shared keep-alive client; independent checks are awaited together
+LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+# One timestamp for the whole run - makes signup/config names unique
+RUN_TS = int(time.time())
+
+
+def _json(response):
+    """Decode a response body (orjson straight from bytes when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
 
 print("=" * 70)
 print("    Live E2E Testing - Binance Trading Bot")
 print("=" * 70)
 
-# Test 1: Health Check
-print("\n[1/8] Testing Health Endpoint...")
-try:
-    response = requests.get(f"{BASE_URL}/api/health", timeout=5)
-    if response.status_code == 200:
-        data = response.json()
-        print(f"[SUCCESS] Health: {data.get('status')} - Mode: {data.get('mode')}")
-    else:
-        print(f"[FAIL] Health check failed: {response.status_code}")
-        sys.exit(1)
-except Exception as e:
-    print(f"[ERROR] Cannot connect to server: {e}")
-    print("\nMake sure server is running:")
-    print("  uvicorn app:app --host 127.0.0.1 --port 8000")
-    sys.exit(1)
 
-# Test 2: OpenAPI Schema
-print("\n[2/8] Testing OpenAPI Schema...")
-try:
-    response = requests.get(f"{BASE_URL}/openapi.json", timeout=5)
-    if response.status_code == 200:
-        schema = response.json()
-        paths = schema.get('paths', {})
-        print(f"[SUCCESS] OpenAPI loaded: {len(paths)} endpoints")
-        
-        # Count by category
-        auth_count = len([p for p in paths if p.startswith('/auth')])
-        config_count = len([p for p in paths if p.startswith('/config')])
-        bot_count = len([p for p in paths if p.startswith('/bot')])
-        
-        print(f"          - Auth endpoints: {auth_count}")
-        print(f"          - Config endpoints: {config_count}")
-        print(f"          - Bot endpoints: {bot_count}")
-    else:
-        print(f"[FAIL] OpenAPI failed: {response.status_code}")
-except Exception as e:
-    print(f"[ERROR] {e}")
-
-# Test 3: User Signup
-print("\n[3/8] Testing User Signup...")
-signup_data = {
-    "username": f"testuser_{int(time.time())}",
-    "email": f"test_{int(time.time())}@example.com",
-    "password": "SecurePassword123!"
-}
+def make_client() -> httpx.AsyncClient:
+    """Network client for E2E_LIVE=1, otherwise in-process ASGI client"""
+    if E2E_LIVE:
+        return httpx.AsyncClient(base_url=BASE_URL, limits=LIMITS, timeout=5.0,
+                                 http2=HTTP2_AVAILABLE)
+    
+    # ASGITransport does not run the app lifespan, so create tables here
+    # (on the throwaway in-memory DB set above)
+    from database.db import init_db
+    from app import app
+    init_db()
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test",
+                             limits=LIMITS, timeout=5.0)
 
-try:
-    response = requests.post(
-        f"{BASE_URL}/auth/signup",
-        json=signup_data,
-        timeout=10
-    )
-    if response.status_code == 201:
-        result = response.json()
-        token = result.get('access_token')
-        user_info = result.get('user', {})
-        print(f"[SUCCESS] Signup successful!")
-        print(f"          - Username: {user_info.get('username')}")
-        print(f"          - Email: {user_info.get('email')}")
-        print(f"          - Token: {token[:30]}...")
-    else:
+
+async def check_health(client: httpx.AsyncClient) -> bool:
+    """[1/8] Health endpoint - False if the server is unreachable"""
+    try:
+        response = await client.get("/api/health")
+        if response.status_code == 200:
+            data = _json(response)
+            print(f"\n[1/8] [SUCCESS] Health: {data.get('status')} - Mode: {data.get('mode')} "
+                  f"({response.http_version})")
+            return True
+        print(f"\n[1/8] [FAIL] Health check failed: {response.status_code}")
+    except Exception as e:
+        print(f"\n[1/8] [ERROR] Cannot connect to server: {e}")
+        if E2E_LIVE:
+            print("\nMake sure server is running:")
+            print("  uvicorn app:app --host 127.0.0.1 --port 8000")
+    return False
+
+
+async def check_openapi(client: httpx.AsyncClient) -> None:
+    """[2/8] OpenAPI schema"""
+    try:
+        response = await client.get("/openapi.json")
+        if response.status_code == 200:
+            schema = _json(response)
+            paths = schema.get('paths', {})
+            print(f"\n[2/8] [SUCCESS] OpenAPI loaded: {len(paths)} endpoints")
+            
+            # Count by category
+            auth_count = config_count = bot_count = 0
+            for p in paths:
+                if p.startswith('/auth'):
+                    auth_count += 1
+                elif p.startswith('/config'):
+                    config_count += 1
+                elif p.startswith('/bot'):
+                    bot_count += 1
+            
+            print(f"          - Auth endpoints: {auth_count}")
+            print(f"          - Config endpoints: {config_count}")
+            print(f"          - Bot endpoints: {bot_count}")
+        else:
+            print(f"\n[2/8] [FAIL] OpenAPI failed: {response.status_code}")
+    except Exception as e:
+        print(f"\n[2/8] [ERROR] {e}")
+
+
+async def signup(client: httpx.AsyncClient):
+    """[3/8] User signup - returns the access token or None"""
+    print("\n[3/8] Testing User Signup...")
+    signup_data = {
+        "username": f"testuser_{RUN_TS}",
+        "email": f"test_{RUN_TS}@example.com",
+        "password": "SecurePassword123!"
+    }
+    
+    try:
+        response = await client.post("/auth/signup", json=signup_data, timeout=10)
+        if response.status_code == 201:
+            result = _json(response)
+            token = result.get('access_token')
+            user_info = result.get('user', {})
+            print(f"[SUCCESS] Signup successful!")
+            print(f"          - Username: {user_info.get('username')}")
+            print(f"          - Email: {user_info.get('email')}")
+            print(f"          - Token: {token[:30]}...")
+            return token
         print(f"[FAIL] Signup failed: {response.status_code}")
         print(f"       Response: {response.text[:200]}")
-        token = None
-except Exception as e:
-    print(f"[ERROR] {e}")
-    token = None
+    except Exception as e:
+        print(f"[ERROR] {e}")
+    return None
 
-if not token:
-    print("\n[SKIP] Cannot continue without authentication token")
-    sys.exit(1)
 
-# Headers for authenticated requests
-headers = {"Authorization": f"Bearer {token}"}
+async def check_profile(client: httpx.AsyncClient, headers: dict) -> None:
+    """[4/8] Get user profile"""
+    try:
+        response = await client.get("/auth/me", headers=headers)
+        if response.status_code == 200:
+            user = _json(response)
+            print(f"\n[4/8] [SUCCESS] Profile retrieved")
+            print(f"          - ID: {user.get('id')}")
+            print(f"          - Username: {user.get('username')}")
+            print(f"          - Email: {user.get('email')}")
+            print(f"          - Active: {user.get('is_active')}")
+        else:
+            print(f"\n[4/8] [FAIL] Profile failed: {response.status_code}")
+    except Exception as e:
+        print(f"\n[4/8] [ERROR] {e}")
 
-# Test 4: Get User Profile
-print("\n[4/8] Testing Get User Profile...")
-try:
-    response = requests.get(f"{BASE_URL}/auth/me", headers=headers, timeout=5)
-    if response.status_code == 200:
-        user = response.json()
-        print(f"[SUCCESS] Profile retrieved")
-        print(f"          - ID: {user.get('id')}")
-        print(f"          - Username: {user.get('username')}")
-        print(f"          - Email: {user.get('email')}")
-        print(f"          - Active: {user.get('is_active')}")
-    else:
-        print(f"[FAIL] Profile failed: {response.status_code}")
-except Exception as e:
-    print(f"[ERROR] {e}")
-
-# Test 5: Get Config Templates
-print("\n[5/8] Testing Config Templates...")
-try:
-    response = requests.get(f"{BASE_URL}/configs/templates", headers=headers, timeout=5)
-    if response.status_code == 200:
-        templates = response.json()
-        print(f"[SUCCESS] Found {len(templates)} templates")
-        for tmpl in templates[:3]:
-            print(f"          - {tmpl.get('name')}: {tmpl.get('description', '')[:50]}")
-    else:
-        print(f"[FAIL] Templates failed: {response.status_code}")
-except Exception as e:
-    print(f"[ERROR] {e}")
-
-# Test 6: Create Bot Config
-print("\n[6/8] Testing Create Bot Config...")
-config_data = {
-    "name": f"Test Config {int(time.time())}",
-    "bot_type": "aggressive",
-    "config_yaml": """
+
+async def check_templates(client: httpx.AsyncClient, headers: dict) -> None:
+    """[5/8] Config templates"""
+    try:
+        response = await client.get("/configs/templates", headers=headers)
+        if response.status_code == 200:
+            templates = _json(response)
+            print(f"\n[5/8] [SUCCESS] Found {len(templates)} templates")
+            for tmpl in islice(templates, 3):
+                print(f"          - {tmpl.get('name')}: {tmpl.get('description', '')[:50]}")
+        else:
+            print(f"\n[5/8] [FAIL] Templates failed: {response.status_code}")
+    except Exception as e:
+        print(f"\n[5/8] [ERROR] {e}")
+
+
+async def create_config(client: httpx.AsyncClient, headers: dict):
+    """[6/8] Create bot config - returns the new config id or None"""
+    config_data = {
+        "name": f"Test Config {RUN_TS}",
+        "bot_type": "aggressive",
+        "config_yaml": """
 bot_type: aggressive
 demo_mode: true
 symbols:
@@ -134,57 +191,84 @@ symbols:
   - ETHUSDT
 max_positions: 3
 """
-}
-
-try:
-    response = requests.post(
-        f"{BASE_URL}/configs/create",
-        json=config_data,
-        headers=headers,
-        timeout=10
-    )
-    if response.status_code == 201:
-        config = response.json()
-        config_id = config.get('id')
-        print(f"[SUCCESS] Config created")
-        print(f"          - ID: {config_id}")
-        print(f"          - Name: {config.get('name')}")
-        print(f"          - Type: {config.get('bot_type')}")
-    else:
-        print(f"[FAIL] Config creation failed: {response.status_code}")
+    }
+    
+    try:
+        response = await client.post("/configs/create", json=config_data, headers=headers, timeout=10)
+        if response.status_code == 201:
+            config = _json(response)
+            config_id = config.get('id')
+            print(f"\n[6/8] [SUCCESS] Config created")
+            print(f"          - ID: {config_id}")
+            print(f"          - Name: {config.get('name')}")
+            print(f"          - Type: {config.get('bot_type')}")
+            return config_id
+        print(f"\n[6/8] [FAIL] Config creation failed: {response.status_code}")
         print(f"       Response: {response.text[:200]}")
-        config_id = None
-except Exception as e:
-    print(f"[ERROR] {e}")
-    config_id = None
+    except Exception as e:
+        print(f"\n[6/8] [ERROR] {e}")
+    return None
 
-# Test 7: Get Bot Status
-print("\n[7/8] Testing Bot Status...")
-try:
-    response = requests.get(f"{BASE_URL}/bots/status", headers=headers, timeout=5)
-    if response.status_code == 200:
-        status = response.json()
-        print(f"[SUCCESS] Bot status retrieved")
-        print(f"          - Status: {status.get('status', 'unknown')}")
-        print(f"          - Running: {status.get('running', False)}")
-    else:
-        print(f"[FAIL] Status failed: {response.status_code}")
-except Exception as e:
-    print(f"[ERROR] {e}")
-
-# Test 8: Get My Configs
-print("\n[8/8] Testing Get My Configs...")
-try:
-    response = requests.get(f"{BASE_URL}/configs/my-configs", headers=headers, timeout=5)
-    if response.status_code == 200:
-        configs = response.json()
-        print(f"[SUCCESS] Found {len(configs)} user configs")
-        for cfg in configs[:3]:
-            print(f"          - {cfg.get('name')} ({cfg.get('bot_type')})")
-    else:
-        print(f"[FAIL] My configs failed: {response.status_code}")
-except Exception as e:
-    print(f"[ERROR] {e}")
+
+async def check_bot_status(client: httpx.AsyncClient, headers: dict) -> None:
+    """[7/8] Bot status"""
+    try:
+        response = await client.get("/bots/status", headers=headers)
+        if response.status_code == 200:
+            status = _json(response)
+            print(f"\n[7/8] [SUCCESS] Bot status retrieved")
+            print(f"          - Status: {status.get('status', 'unknown')}")
+            print(f"          - Running: {status.get('running', False)}")
+        else:
+            print(f"\n[7/8] [FAIL] Status failed: {response.status_code}")
+    except Exception as e:
+        print(f"\n[7/8] [ERROR] {e}")
+
+
+async def check_my_configs(client: httpx.AsyncClient, headers: dict) -> None:
+    """[8/8] Configs owned by the user (runs after create so it can see it)"""
+    try:
+        response = await client.get("/configs/my-configs", headers=headers)
+        if response.status_code == 200:
+            configs = _json(response)
+            print(f"\n[8/8] [SUCCESS] Found {len(configs)} user configs")
+            for cfg in islice(configs, 3):
+                print(f"          - {cfg.get('name')} ({cfg.get('bot_type')})")
+        else:
+            print(f"\n[8/8] [FAIL] My configs failed: {response.status_code}")
+    except Exception as e:
+        print(f"\n[8/8] [ERROR] {e}")
+
+
+async def main() -> int:
+    async with make_client() as client:
+        # Unauthenticated checks have no dependency on each other
+        healthy, _ = await asyncio.gather(check_health(client), check_openapi(client))
+        if not healthy:
+            return 1
+        
+        # Everything below needs the token, so signup stays sequential
+        token = await signup(client)
+        if not token:
+            print("\n[SKIP] Cannot continue without authentication token")
+            return 1
+        
+        # Headers for authenticated requests
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        await asyncio.gather(
+            check_profile(client, headers),
+            check_templates(client, headers),
+            create_config(client, headers),
+            check_bot_status(client, headers),
+        )
+        await check_my_configs(client, headers)
+    
+    return 0
+
+
+if asyncio.run(main()):
+    sys.exit(1)
 
 # Summary
 print("\n" + "=" * 70)
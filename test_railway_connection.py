@@ -64,50 +64,76 @@ print("\n" + "-" * 70)
 print("Testing database connection...")
 print("-" * 70)
 
+# Catalog queries built once - used before and after init_db
+if is_postgres:
+    CATALOG_QUERY = text("""
+        SELECT table_name 
+        FROM information_schema.tables 
+        WHERE table_schema='public'
+        ORDER BY table_name
+    """)
+    # Every table name + exact row count in a single statement (one
+    # round-trip to Railway instead of catalog + one COUNT per table)
+    TABLE_COUNTS_QUERY = text("""
+        SELECT table_name,
+               (xpath('/row/c/text()',
+                      query_to_xml(format('SELECT COUNT(*) AS c FROM %I.%I', table_schema, table_name),
+                                   false, true, '')))[1]::text::bigint
+        FROM information_schema.tables 
+        WHERE table_schema='public'
+        ORDER BY table_name
+    """)
+else:
+    CATALOG_QUERY = text("""
+        SELECT name FROM sqlite_master 
+        WHERE type='table' AND name NOT LIKE 'sqlite_%'
+        ORDER BY name
+    """)
+    TABLE_COUNTS_QUERY = None
+
+
+def fetch_table_counts(conn):
+    """[(table, count or None)] for every user table"""
+    if TABLE_COUNTS_QUERY is not None:
+        return [(name, count) for name, count in conn.execute(TABLE_COUNTS_QUERY)]
+    
+    # SQLite is local: catalog, then all counts in one UNION ALL query
+    tables = [row[0] for row in conn.execute(CATALOG_QUERY)]
+    if not tables:
+        return []
+    count_query = " UNION ALL ".join(
+        f"SELECT '{table}' AS name, COUNT(*) AS c FROM \"{table}\"" for table in tables
+    )
+    try:
+        counts = dict(conn.execute(text(count_query)).fetchall())
+    except:
+        counts = {}
+    return [(table, counts.get(table)) for table in tables]
+
+
 try:
     with engine.connect() as conn:
-        # Test basic query
-        result = conn.execute(text("SELECT 1 as test"))
-        test_value = result.fetchone()[0]
+        # Connectivity check + server version in one round-trip
+        version_fn = "version()" if is_postgres else "sqlite_version()"
+        test_value, version = conn.execute(text(f"SELECT 1 AS test, {version_fn}")).fetchone()
         
         if test_value == 1:
             print("[SUCCESS] Database connection works!")
         
-        # Get database version
         if is_postgres:
-            result = conn.execute(text("SELECT version()"))
-            version = result.fetchone()[0]
             print(f"[INFO] PostgreSQL Version: {version[:60]}...")
         else:
-            print(f"[INFO] SQLite database")
+            print(f"[INFO] SQLite database (version {version})")
         
         # Check existing tables
-        if is_postgres:
-            query = text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema='public'
-                ORDER BY table_name
-            """)
-        else:
-            query = text("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name NOT LIKE 'sqlite_%'
-                ORDER BY name
-            """)
-        
-        result = conn.execute(query)
-        tables = [row[0] for row in result]
+        table_counts = fetch_table_counts(conn)
         
-        if tables:
-            print(f"\n[SUCCESS] Found {len(tables)} existing tables:")
-            for table in tables:
-                # Count records in each table
-                try:
-                    count_result = conn.execute(text(f"SELECT COUNT(*) FROM {table}"))
-                    count = count_result.fetchone()[0]
+        if table_counts:
+            print(f"\n[SUCCESS] Found {len(table_counts)} existing tables:")
+            for table, count in table_counts:
+                if count is not None:
                     print(f"          - {table:20} ({count} records)")
-                except:
+                else:
                     print(f"          - {table}")
         else:
             print("\n[INFO] No tables found yet (will be created below)")
@@ -132,21 +158,7 @@ try:
     
     # Verify tables were created
     with engine.connect() as conn:
-        if is_postgres:
-            query = text("""
-                SELECT table_name 
-                FROM information_schema.tables 
-                WHERE table_schema='public'
-                ORDER BY table_name
-            """)
-        else:
-            query = text("""
-                SELECT name FROM sqlite_master 
-                WHERE type='table' AND name NOT LIKE 'sqlite_%'
-                ORDER BY name
-            """)
-        
-        result = conn.execute(query)
+        result = conn.execute(CATALOG_QUERY)
         tables = [row[0] for row in result]
         
         print(f"\n[SUCCESS] Verified {len(tables)} tables:")
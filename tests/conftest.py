@@ -1,12 +1,20 @@
 """
 Pytest configuration and fixtures
 """
+import os
 import pytest
+import pytest_asyncio
 import sys
 from pathlib import Path
+from typing import NamedTuple
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Must be set before auth.security is imported (cheap password hashing)
+os.environ.setdefault("TESTING", "1")
+# Must be set before database.db is imported - tests never touch a real DB
+os.environ["DATABASE_URL"] = "sqlite:///:memory:"
+
+# Add the repo root to the path once for every test module
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import numpy as np
 from unittest.mock import Mock, MagicMock
@@ -14,9 +22,17 @@ from datetime import datetime
 
 
 # ==================== MOCK DATA ====================
-@pytest.fixture
+def _readonly(values) -> np.ndarray:
+    """Contiguous float64 array that raises on write (shared across tests)"""
+    arr = np.tile(np.asarray(values, dtype=np.float64), 3)
+    arr.setflags(write=False)
+    return arr
+
+
+# Read-only payloads are built once per session - tests must not mutate them
+@pytest.fixture(scope="session")
 def sample_klines_data():
-    """Sample klines data for testing"""
+    """Sample klines data for testing (shared, do not mutate)"""
     return [
         [1609459200000, '29000.00', '29500.00', '28800.00', '29200.00', '100.5', 
          1609462799999, '2920000.00', 150, '50.2', '1460400.00', '0'],
@@ -26,21 +42,30 @@ def sample_klines_data():
     ] * 20  # 40 candles total
 
 
-@pytest.fixture
+class PriceBars(NamedTuple):
+    """Column-wise (SoA) OHLCV bars - each field is a contiguous float64 array"""
+    close: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    volume: np.ndarray
+    current_price: float
+
+
+@pytest.fixture(scope="session")
 def sample_price_data():
-    """Sample price data for indicators"""
-    return {
-        'close': np.array([29000, 29200, 29400, 29300, 29500, 29600, 29400, 29700, 29800, 30000] * 3),
-        'high': np.array([29500, 29600, 29800, 29700, 29900, 30000, 29800, 30100, 30200, 30400] * 3),
-        'low': np.array([28800, 29000, 29200, 29100, 29300, 29400, 29200, 29500, 29600, 29800] * 3),
-        'volume': np.array([100, 95, 110, 105, 120, 115, 100, 130, 125, 140] * 3),
-        'current_price': 30000.0
-    }
+    """Sample price data for indicators (read-only arrays)"""
+    return PriceBars(
+        close=_readonly([29000, 29200, 29400, 29300, 29500, 29600, 29400, 29700, 29800, 30000]),
+        high=_readonly([29500, 29600, 29800, 29700, 29900, 30000, 29800, 30100, 30200, 30400]),
+        low=_readonly([28800, 29000, 29200, 29100, 29300, 29400, 29200, 29500, 29600, 29800]),
+        volume=_readonly([100, 95, 110, 105, 120, 115, 100, 130, 125, 140]),
+        current_price=30000.0
+    )
 
 
 @pytest.fixture
 def mock_binance_client():
-    """Mock Binance API client"""
+    """Mock Binance API client (per test - a Mock records its calls)"""
     client = Mock()
     
     # Mock account balance
@@ -63,6 +88,57 @@ def mock_binance_client():
     return client
 
 
+@pytest.fixture(scope="session")
+def _db_tables():
+    """Create the schema once on the in-memory engine"""
+    from database.db import init_db
+    
+    init_db()
+
+
+@pytest.fixture
+def db_session(_db_tables):
+    """Session inside an outer transaction that is rolled back after the test"""
+    from database.db import SessionLocal, engine
+    
+    connection = engine.connect()
+    transaction = connection.begin()
+    # Joined to the outer transaction: session.commit() flushes, never commits
+    session = SessionLocal(bind=connection)
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Shared TestClient for the main FastAPI app (built once per session)"""
+    from fastapi.testclient import TestClient
+    from app import app
+    
+    return TestClient(app)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def api_client():
+    """
+    Shared async client for the FastAPI app (in-process ASGI, no server)
+    
+    One client and connection pool for the whole session - async tests must
+    use @pytest.mark.asyncio(loop_scope="session") to share its event loop.
+    """
+    import httpx
+    from app import app
+    
+    transport = httpx.ASGITransport(app=app)
+    limits = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test", limits=limits) as client:
+        yield client
+
+
 @pytest.fixture
 def mock_position():
     """Mock Position object"""
@@ -1,59 +1,18 @@
 """
 Integration Tests for FastAPI endpoints
 """
+import asyncio
 import pytest
-from fastapi.testclient import TestClient
-from app import app
 import json
 
 
-@pytest.fixture
-def client():
-    """Test client for FastAPI"""
-    return TestClient(app)
+# `client` is the session-scoped TestClient fixture from conftest.py
 
 
 class TestAPIEndpoints:
     """Test API endpoints"""
     
-    def test_root_endpoint(self, client):
-        """Test root endpoint redirects to login"""
-        response = client.get("/")
-        assert response.status_code == 200
-        assert "Redirecting to login" in response.text
-        
-    def test_health_check(self, client):
-        """Test health check endpoint"""
-        response = client.get("/api/health")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "status" in data
-        assert data["status"] == "healthy"
-        assert "timestamp" in data
-        
-    def test_get_stats(self, client):
-        """Test stats endpoint"""
-        response = client.get("/api/stats")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "profit" in data
-        assert "trades" in data
-        assert "positions" in data
-        assert "uptime" in data
-        
-    def test_get_config(self, client):
-        """Test config endpoint"""
-        response = client.get("/api/config")
-        assert response.status_code == 200
-        
-        data = response.json()
-        assert "demo_mode" in data
-        assert "max_positions" in data
-        assert "symbols" in data
-        assert isinstance(data["symbols"], list)
-        
+    @pytest.mark.xdist_group(name="bot_runtime")
     def test_start_bot_invalid_type(self, client):
         """Test starting bot with invalid type"""
         response = client.post(
@@ -63,6 +22,7 @@ class TestAPIEndpoints:
         # Should either accept or reject - test that it doesn't crash
         assert response.status_code in [200, 400, 422]
         
+    @pytest.mark.xdist_group(name="bot_runtime")
     def test_stop_bot_when_not_running(self, client):
         """Test stopping bot when not running"""
         response = client.post("/api/bot/stop")
@@ -73,56 +33,79 @@ class TestAPIEndpoints:
 class TestWebSocket:
     """Test WebSocket functionality"""
     
-    def test_websocket_connection(self, client):
-        """Test WebSocket connection"""
+    def test_websocket_connection(self, client, monkeypatch):
+        """Test WebSocket connection receives a periodic update"""
+        from app import bot_status
+        
+        # Stats are pushed when uptime hits a multiple of 10 (every 5s);
+        # start one tick before so the first update arrives after 0.5s
+        monkeypatch.setitem(bot_status, "uptime", 9)
+        
         with client.websocket_connect("/ws") as websocket:
             # Should connect successfully
             data = websocket.receive_json()
             assert data is not None
-            
-            # Should receive periodic updates
-            # Note: This might timeout in test environment
-            try:
-                data = websocket.receive_json(timeout=2)
-                assert "type" in data
-            except:
-                pass  # Timeout is acceptable in test
+            assert data["type"] in ("stats", "log")
+
+
+_BOT_RUNTIME = pytest.mark.xdist_group(name="bot_runtime")
 
 
 class TestAPIValidation:
-    """Test API input validation"""
+    """Test API input validation and error handling"""
     
-    def test_start_bot_missing_body(self, client):
-        """Test start bot without request body"""
-        response = client.post("/api/bot/start")
-        assert response.status_code == 422  # Validation error
-        
-    def test_start_bot_invalid_json(self, client):
-        """Test start bot with invalid JSON"""
-        response = client.post(
-            "/api/bot/start",
-            data="invalid json",
-            headers={"Content-Type": "application/json"}
-        )
-        assert response.status_code == 422
-        
-    def test_cors_headers(self, client):
-        """Test CORS middleware is configured"""
-        response = client.options("/api/health")
-        # CORS headers may or may not be present depending on request
-        # Just verify OPTIONS method is handled
-        assert response.status_code in [200, 405]
+    @pytest.mark.parametrize("method,path,kwargs,expected", [
+        # Start bot without request body -> validation error
+        pytest.param("post", "/api/bot/start", {}, {422}, id="start-missing-body", marks=_BOT_RUNTIME),
+        # Start bot with invalid JSON
+        pytest.param("post", "/api/bot/start",
+                     {"content": "invalid json", "headers": {"Content-Type": "application/json"}},
+                     {422}, id="start-invalid-json", marks=_BOT_RUNTIME),
+        # OPTIONS is handled (CORS headers depend on the request)
+        pytest.param("options", "/api/health", {}, {200, 405}, id="cors-options"),
+        # Wrong HTTP method - start is POST only
+        pytest.param("get", "/api/bot/start", {}, {405}, id="method-not-allowed"),
+    ])
+    def test_validation_matrix(self, client, method, path, kwargs, expected):
+        """Status code for malformed / disallowed requests"""
+        response = getattr(client, method)(path, **kwargs)
+        assert response.status_code in expected
 
 
-class TestErrorHandling:
-    """Test error handling"""
+@pytest.mark.asyncio(loop_scope="session")
+class TestReadOnlyEndpoints:
+    """Stateless GET endpoints, fetched concurrently over the shared api_client"""
     
-    def test_404_endpoint(self, client):
-        """Test non-existent endpoint"""
-        response = client.get("/api/nonexistent")
-        assert response.status_code == 404
+    async def test_readonly_endpoints(self, api_client):
+        """Root, health, stats, config and 404 in one asyncio.gather"""
+        paths = ["/", "/api/health", "/api/stats", "/api/config", "/api/nonexistent"]
+        root, health, stats, config, missing = await asyncio.gather(
+            *(api_client.get(path) for path in paths)
+        )
+        
+        # Root redirects to login
+        assert root.status_code == 200
+        assert "Redirecting to login" in root.text
+        
+        assert health.status_code == 200
+        data = health.json()
+        assert "status" in data
+        assert data["status"] == "healthy"
+        assert "timestamp" in data
+        
+        assert stats.status_code == 200
+        data = stats.json()
+        assert "profit" in data
+        assert "trades" in data
+        assert "positions" in data
+        assert "uptime" in data
+        
+        assert config.status_code == 200
+        data = config.json()
+        assert "demo_mode" in data
+        assert "max_positions" in data
+        assert "symbols" in data
+        assert isinstance(data["symbols"], list)
         
-    def test_method_not_allowed(self, client):
-        """Test wrong HTTP method"""
-        response = client.get("/api/bot/start")  # Should be POST
-        assert response.status_code == 405
+        # Non-existent endpoint
+        assert missing.status_code == 404
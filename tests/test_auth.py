@@ -5,19 +5,17 @@ Run: pytest tests/test_auth.py -v
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
-import sys
-from pathlib import Path
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from database.db import get_db
-from database.models import Base, User, BotConfig
+from database.models import Base, User
 from auth.security import get_password_hash, verify_password, encrypt_api_key, decrypt_api_key
 
+# The in-memory DB lives in one process - keep this module on one xdist worker
+pytestmark = pytest.mark.xdist_group(name="auth_db")
+
 # Test database (in-memory SQLite with single connection)
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
 engine = create_engine(
@@ -25,6 +23,19 @@ engine = create_engine(
     connect_args={"check_same_thread": False},
     poolclass=StaticPool
 )
+
+
+@event.listens_for(engine, "connect")
+def _sqlite_on_connect(dbapi_connection, connection_record):
+    """Hand transaction control to SQLAlchemy (for SAVEPOINT)"""
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _sqlite_on_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create tables once at module level
@@ -54,17 +65,45 @@ client = TestClient(app)
 
 @pytest.fixture(scope="function", autouse=True)
 def test_db():
-    """Clean database after each test"""
-    yield
-    # Delete all rows from tables (but keep schema)
+    """Run each test inside an outer transaction that is rolled back"""
+    connection = engine.connect()
+    transaction = connection.begin()
+    # One session per test, shared by its requests; app commits become SAVEPOINTs
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
+    
+    def _override_get_db():
+        yield session
+    
+    app.dependency_overrides[get_db] = _override_get_db
+    try:
+        yield session
+    finally:
+        app.dependency_overrides[get_db] = override_get_db
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="module")
+def authed_user():
+    """
+    One committed signup shared by the module's authenticated tests
+    
+    Created outside the per-test transaction, so test_db rollbacks keep it;
+    changes tests make to it (API keys) are still rolled back.
+    """
+    response = client.post("/auth/signup", json={
+        "username": "authed_user",
+        "email": "authed@example.com",
+        "password": "password123"
+    })
+    assert response.status_code == 201
+    yield response.json()
+    
     db = TestingSessionLocal()
     try:
-        # Delete in correct order to avoid FK constraint issues
-        db.query(BotConfig).delete()
-        db.query(User).delete()
+        db.query(User).filter(User.username == "authed_user").delete()
         db.commit()
-    except Exception:
-        db.rollback()
     finally:
         db.close()
 
@@ -207,15 +246,9 @@ class TestUserLogin:
 class TestUserProfile:
     """Test user profile endpoints"""
     
-    def test_get_profile(self, test_db):
+    def test_get_profile(self, test_db, authed_user):
         """Test getting user profile"""
-        # Signup and get token
-        signup_response = client.post("/auth/signup", json={
-            "username": "profileuser",
-            "email": "profile@example.com",
-            "password": "password123"
-        })
-        token = signup_response.json()["access_token"]
+        token = authed_user["access_token"]
         
         # Get profile
         response = client.get("/auth/me", headers={
@@ -224,8 +257,8 @@ class TestUserProfile:
         
         assert response.status_code == 200
         data = response.json()
-        assert data["username"] == "profileuser"
-        assert data["email"] == "profile@example.com"
+        assert data["username"] == "authed_user"
+        assert data["email"] == "authed@example.com"
         assert data["is_active"] is True
         assert data["has_api_keys"] is False
     
@@ -239,71 +272,25 @@ class TestUserProfile:
 class TestAPIKeys:
     """Test API key management"""
     
-    def test_update_api_keys(self, test_db):
-        """Test updating API keys"""
-        # Signup and get token
-        signup_response = client.post("/auth/signup", json={
-            "username": "apikeyuser",
-            "email": "apikey@example.com",
-            "password": "password123"
-        })
-        token = signup_response.json()["access_token"]
+    def test_api_keys_lifecycle(self, test_db, authed_user):
+        """Test adding then deleting API keys in one signup-backed flow"""
+        headers = {"Authorization": f"Bearer {authed_user['access_token']}"}
         
-        # Update API keys
-        response = client.post("/auth/api-keys", 
-            headers={"Authorization": f"Bearer {token}"},
-            json={
-                "api_key": "test-api-key-12345",
-                "api_secret": "test-api-secret-67890",
-                "use_testnet": True
-            }
-        )
+        # Add API keys
+        response = client.post("/auth/api-keys", headers=headers, json={
+            "api_key": "test-api-key-12345",
+            "api_secret": "test-api-secret-67890",
+            "use_testnet": True
+        })
         
         assert response.status_code == 200
         assert response.json()["success"] is True
-        
-        # Check status
-        status_response = client.get("/auth/api-keys/status",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        
-        assert status_response.json()["has_api_keys"] is True
-    
-    def test_delete_api_keys(self, test_db):
-        """Test deleting API keys"""
-        # Signup and get token
-        signup_response = client.post("/auth/signup", json={
-            "username": "deleteuser",
-            "email": "delete@example.com",
-            "password": "password123"
-        })
-        token = signup_response.json()["access_token"]
-        
-        # Add API keys
-        client.post("/auth/api-keys",
-            headers={"Authorization": f"Bearer {token}"},
-            json={
-                "api_key": "test-key",
-                "api_secret": "test-secret",
-                "use_testnet": True
-            }
-        )
+        assert client.get("/auth/api-keys/status", headers=headers).json()["has_api_keys"] is True
         
         # Delete API keys
-        response = client.delete("/auth/api-keys",
-            headers={"Authorization": f"Bearer {token}"}
-        )
+        response = client.delete("/auth/api-keys", headers=headers)
         
         assert response.status_code == 200
         assert response.json()["success"] is True
-        
-        # Check status
-        status_response = client.get("/auth/api-keys/status",
-            headers={"Authorization": f"Bearer {token}"}
-        )
-        
-        assert status_response.json()["has_api_keys"] is False
-
+        assert client.get("/auth/api-keys/status", headers=headers).json()["has_api_keys"] is False
 
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
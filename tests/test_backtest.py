@@ -0,0 +1,129 @@
+"""
+Tests for backtest results saving
+"""
+import json
+import logging
+import pytest
+import pandas as pd
+from unittest.mock import Mock, patch
+from datetime import datetime, timedelta, UTC
+
+from backtest.performance_metrics import PerformanceMetrics
+from backtest.results_io import write_json
+
+START = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _trades(pnls=(1.5, -0.8, 2.1, -0.4, 0.9, 1.2)):
+    """Closed trades as BacktestEngine records them, spread over hours and days"""
+    trades = []
+    for i, pnl in enumerate(pnls):
+        entry = START + timedelta(hours=7 * i)
+        trades.append({
+            'symbol': 'BTCUSDT' if i % 2 else 'ETHUSDT',
+            'side': 'BUY',
+            'entry_time': entry,
+            'exit_time': (entry + timedelta(minutes=5)).replace(tzinfo=None),
+            'entry_price': 30000.0,
+            'exit_price': 30000.0 + pnl * 100,
+            'quantity': 0.01,
+            'pnl': pnl,
+            'pnl_pct': pnl,
+            'reason': 'TP' if pnl > 0 else 'SL',
+            'duration_seconds': 300.0
+        })
+    return trades
+
+
+def _mock_loader():
+    """HistoricalDataLoader stand-in returning one symbol of candles"""
+    loader = Mock()
+    loader.prepare_multiple_symbols.return_value = {'BTCUSDT': pd.DataFrame({'close': [30000.0]})}
+    loader.summarize_symbols.return_value = pd.DataFrame(
+        {'total_candles': [1], 'price_min': [30000.0], 'price_max': [30000.0]}, index=['BTCUSDT']
+    )
+    return loader
+
+
+def _mock_engine(trades):
+    engine = Mock()
+    engine.run_backtest.return_value = {'trades': trades}
+    engine.iter_trades.side_effect = lambda: iter(trades)
+    return engine
+
+
+def _saved_results(tmp_path, pattern):
+    (output_file,) = (tmp_path / "backtest" / "results").glob(pattern)
+    return json.loads(output_file.read_bytes())
+
+
+class TestResultsIO:
+    """Test JSON results writing"""
+    
+    def test_write_json_metrics(self, tmp_path):
+        """Real calculate_metrics output (int-keyed by_hour) can be written"""
+        metrics = PerformanceMetrics.calculate_metrics(_trades(), initial_balance=100.0)
+        assert any(isinstance(k, int) for k in metrics['time_stats']['by_hour'])
+        
+        path = write_json(tmp_path / "metrics.json", {"metrics": metrics})
+        
+        saved = json.loads(path.read_bytes())
+        assert saved['metrics']['total_trades'] == 6
+        assert set(saved['metrics']['time_stats']['by_hour']) == {
+            str(k) for k in metrics['time_stats']['by_hour']
+        }
+
+
+class TestBacktestScriptsSave:
+    """Test the backtest scripts' results files"""
+    
+    def test_run_backtest_saves_results(self, tmp_path, monkeypatch):
+        """scripts/run_backtest.py writes its results JSON"""
+        from scripts import run_backtest as script
+        
+        monkeypatch.chdir(tmp_path)
+        trades = _trades()
+        with patch.object(script, 'Spot'), \
+             patch.object(script, 'HistoricalDataLoader', return_value=_mock_loader()), \
+             patch.object(script, 'BacktestEngine', return_value=_mock_engine(trades)):
+            script.run_backtest(['BTCUSDT'], START, START + timedelta(days=2), initial_balance=100.0,
+                                fp32=False, http_cache=False)
+        
+        saved = _saved_results(tmp_path, "backtest_*.json")
+        assert saved['metrics']['total_trades'] == len(trades)
+    
+    def test_run_aggressive_backtest_saves_results(self, tmp_path, monkeypatch):
+        """scripts/run_backtest_aggressive.py writes its results JSON"""
+        from scripts import run_backtest_aggressive as script
+        
+        monkeypatch.chdir(tmp_path)
+        trades = _trades()
+        with patch('binance.spot.Spot'), \
+             patch('backtest.data_loader.HistoricalDataLoader', return_value=_mock_loader()), \
+             patch('backtest.backtest_engine.BacktestEngine', return_value=_mock_engine(trades)):
+            script.run_aggressive_backtest(['BTCUSDT'], START, START + timedelta(days=2), initial_balance=100.0,
+                                           fp32=False, http_cache=False)
+        
+        saved = _saved_results(tmp_path, "backtest_aggressive_*.json")
+        assert saved['bot_type'] == 'aggressive_recovery'
+        assert saved['metrics']['total_trades'] == len(trades)
+    
+    def test_aggressive_risk_warnings_in_quiet_runs(self, caplog):
+        """Martingale/drawdown warnings still log when INFO is off"""
+        from scripts import run_backtest_aggressive as script
+        
+        caplog.set_level(logging.WARNING, logger=script.logger.name)
+        trades = _trades(pnls=(-30.0, -30.0, -30.0, 5.0))
+        metrics = PerformanceMetrics.calculate_metrics(trades, initial_balance=100.0)
+        metrics['max_drawdown_pct'] = 25.0
+        with patch('binance.spot.Spot'), \
+             patch('backtest.data_loader.HistoricalDataLoader', return_value=_mock_loader()), \
+             patch('backtest.backtest_engine.BacktestEngine', return_value=_mock_engine(trades)), \
+             patch.object(PerformanceMetrics, 'calculate_metrics', return_value=metrics):
+            script.run_aggressive_backtest(['BTCUSDT'], START, START + timedelta(days=2), initial_balance=100.0,
+                                           fp32=False, http_cache=False, save_results=False)
+        
+        messages = [r.getMessage() for r in caplog.records if r.name == script.logger.name]
+        assert any("max martingale level" in m for m in messages)
+        assert any("HIGH RISK" in m for m in messages)
+        assert not any("Recovery Opportunities" in m for m in messages)
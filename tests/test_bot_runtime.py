@@ -1,63 +1,94 @@
 """
 Integration Tests for Bot Runtime Logic
 """
+import copy
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, UTC
 import numpy as np
 
+from bots.aggressive_recovery_bot import AggressiveRecoveryBot
+from core.models import Position, TradeHistory
+
+# Fixed exit timestamp - the assertions are on P&L, never on the clock
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.setflags(write=False)
+    return arr
+
+
+# Oversold + volume + MACD bullish setup (two 20-candle cycles), built once
+# and shared read-only: sell-off 29000 -> 27800, then a rebound to 29000
+_STRONG_BUY_CLOSE = _readonly(np.tile(np.concatenate([
+    np.arange(29000, 27799, -100),
+    np.arange(27900, 28001, 100),
+    np.arange(28200, 29001, 200),
+]).astype(np.float64), 2))
+_STRONG_BUY_DATA = {
+    'close': _STRONG_BUY_CLOSE,
+    'high': _readonly(_STRONG_BUY_CLOSE + 100),
+    'low': _readonly(_STRONG_BUY_CLOSE - 100),
+    'volume': _readonly(np.tile(np.arange(100, 300, 10, dtype=np.float64), 2)),
+    'current_price': 29000.0
+}
+
+_USDT_ACCOUNT = {'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]}
+
+# Raw Binance klines (strings, as the bot's pandas parser expects) - built once
+_KLINES_RAW = [
+    [1609459200000, '29000.00', '29500.00', '28800.00', '29200.00', '100.5',
+     1609462799999, '2920000.00', 150, '50.2', '1460400.00', '0']
+] * 50
+
+
+@pytest.fixture(scope="module")
+def aggressive_bot():
+    """One AggressiveRecoveryBot (Spot patched) built once for the module"""
+    spot_patch = patch('bots.aggressive_recovery_bot.Spot')
+    mock_spot = spot_patch.start()
+    mock_spot.return_value = Mock()
+    mock_spot.return_value.account.return_value = _USDT_ACCOUNT
+    try:
+        yield AggressiveRecoveryBot()
+    finally:
+        spot_patch.stop()
+
+
+@pytest.fixture
+def bot(aggressive_bot):
+    """Shared bot with the mutable runtime state reset for each test"""
+    b = aggressive_bot
+    start_balance = b.trade_history.daily_start_balance
+    b.client.reset_mock(return_value=True, side_effect=True)
+    b.client.account.return_value = _USDT_ACCOUNT
+    b.consecutive_wins = 0
+    b.consecutive_losses = 0
+    b.last_loss_symbol = None
+    b.martingale_level.clear()
+    b.recovery_positions.clear()
+    b.running = False
+    b.trading_paused = False
+    b.profit_locked = False
+    b.trade_history = TradeHistory(starting_balance=start_balance)
+    b.daily_peak_balance = start_balance
+    return b
+
 
 class TestAggressiveBotRuntime:
     """Test AggressiveRecoveryBot runtime behavior"""
     
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_calculate_signals_strong_buy(self, mock_spot):
+    def test_calculate_signals_strong_buy(self, bot):
         """Test signal calculation for strong buy setup"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
-        # Mock client
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        mock_spot.return_value = mock_client
-        
-        bot = AggressiveRecoveryBot()
-        
-        # Create oversold + volume + MACD bullish data
-        data = {
-            'close': np.array([29000, 28900, 28800, 28700, 28600, 28500, 28400, 28300, 
-                              28200, 28100, 28000, 27900, 27800, 27900, 28000, 28200,
-                              28400, 28600, 28800, 29000] * 2),
-            'high': np.array([29100, 29000, 28900, 28800, 28700, 28600, 28500, 28400,
-                             28300, 28200, 28100, 28000, 27900, 28000, 28100, 28300,
-                             28500, 28700, 28900, 29100] * 2),
-            'low': np.array([28900, 28800, 28700, 28600, 28500, 28400, 28300, 28200,
-                            28100, 28000, 27900, 27800, 27700, 27800, 27900, 28100,
-                            28300, 28500, 28700, 28900] * 2),
-            'volume': np.array([100, 110, 120, 130, 140, 150, 160, 170, 180, 190,
-                               200, 210, 220, 230, 240, 250, 260, 270, 280, 290] * 2),
-            'current_price': 29000.0
-        }
-        
-        signals = bot.calculate_signals('BTCUSDT', data)
+        signals = bot.calculate_signals('BTCUSDT', _STRONG_BUY_DATA)
         
         assert 'buy_strength' in signals
         assert 'sell_strength' in signals
         assert isinstance(signals['buy_strength'], (int, float))
         
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_calculate_adaptive_position_size(self, mock_spot):
+    def test_calculate_adaptive_position_size(self, bot):
         """Test adaptive position sizing"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        mock_spot.return_value = mock_client
-        
-        bot = AggressiveRecoveryBot()
         bot.consecutive_wins = 3  # Win streak
         
         quantity = bot.calculate_adaptive_position_size(
@@ -70,18 +101,8 @@ class TestAggressiveBotRuntime:
         assert quantity > 0
         assert isinstance(quantity, float)
         
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_martingale_recovery(self, mock_spot):
+    def test_martingale_recovery(self, bot):
         """Test martingale recovery logic"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        mock_spot.return_value = mock_client
-        
-        bot = AggressiveRecoveryBot()
         bot.consecutive_losses = 2
         bot.last_loss_symbol = 'BTCUSDT'
         bot.martingale_level['BTCUSDT'] = 1
@@ -104,19 +125,8 @@ class TestAggressiveBotRuntime:
         # Recovery should be larger (due to martingale)
         assert recovery_qty >= normal_qty or recovery_qty > 0
         
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_check_daily_status_target_reached(self, mock_spot):
+    def test_check_daily_status_target_reached(self, bot):
         """Test daily profit target check"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        mock_spot.return_value = mock_client
-        
-        bot = AggressiveRecoveryBot()
-        
         # Simulate reaching target
         bot.trade_history.current_balance = 1050.0  # +5%
         
@@ -126,10 +136,10 @@ class TestAggressiveBotRuntime:
         assert bot.running is False
 
 
+@patch('bots.daily_scalping_bot.Spot')
 class TestScalpingBotRuntime:
-    """Test DailyScalpingBot runtime behavior"""
+    """Test DailyScalpingBot runtime behavior (Spot patched for every method)"""
     
-    @patch('bots.daily_scalping_bot.Spot')
     def test_multi_timeframe_analysis(self, mock_spot):
         """Test multi-timeframe signal confirmation"""
         from bots.daily_scalping_bot import DailyScalpingBot
@@ -154,19 +164,11 @@ class TestScalpingBotRuntime:
 class TestBotStateManagement:
     """Test bot state save/load"""
     
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_save_and_load_state(self, mock_spot):
+    def test_save_and_load_state(self, bot, tmp_path, monkeypatch):
         """Test state persistence"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        import os
-        
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        mock_spot.return_value = mock_client
+        state_file = tmp_path / "bot_state_aggressive.json"
+        monkeypatch.setattr(AggressiveRecoveryBot, "STATE_FILE", str(state_file))
         
-        bot = AggressiveRecoveryBot()
         bot.consecutive_wins = 5
         bot.consecutive_losses = 0
         bot.martingale_level['BTCUSDT'] = 2
@@ -175,44 +177,22 @@ class TestBotStateManagement:
         bot.save_state()
         
         # Check file exists
-        assert os.path.exists('bot_state_aggressive.json')
+        assert state_file.exists()
         
         # Create new bot and load
         bot2 = AggressiveRecoveryBot()
         
         # State should be loaded (or handle gracefully)
         assert bot2.consecutive_wins >= 0
-        
-        # Cleanup
-        if os.path.exists('bot_state_aggressive.json'):
-            os.remove('bot_state_aggressive.json')
 
 
 class TestBotErrorHandling:
     """Test bot error handling"""
     
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_api_retry_logic(self, mock_spot):
+    def test_api_retry_logic(self, bot):
         """Test API retry on failure"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        
         # First call fails, second succeeds
-        mock_client.klines.side_effect = [
-            Exception("Network error"),
-            [
-                [1609459200000, '29000.00', '29500.00', '28800.00', '29200.00', '100.5',
-                 1609462799999, '2920000.00', 150, '50.2', '1460400.00', '0']
-            ] * 50
-        ]
-        
-        mock_spot.return_value = mock_client
-        
-        bot = AggressiveRecoveryBot()
+        bot.client.klines.side_effect = [Exception("Network error"), _KLINES_RAW]
         
         # Should retry and eventually succeed
         data = bot.get_market_data('BTCUSDT')
@@ -221,22 +201,10 @@ class TestBotErrorHandling:
         # If data, retry succeeded
         assert data is None or 'current_price' in data
         
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_invalid_market_data(self, mock_spot):
+    def test_invalid_market_data(self, bot):
         """Test handling of invalid market data"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        
         # Return empty klines
-        mock_client.klines.return_value = []
-        
-        mock_spot.return_value = mock_client
-        
-        bot = AggressiveRecoveryBot()
+        bot.client.klines.return_value = []
         
         # Should handle gracefully
         data = bot.get_market_data('BTCUSDT')
@@ -246,52 +214,25 @@ class TestBotErrorHandling:
 class TestBotPerformanceMetrics:
     """Test performance tracking"""
     
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_win_rate_calculation(self, mock_spot):
+    def test_win_rate_calculation(self, bot):
         """Test win rate tracking"""
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        from core.models import Position
-        
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [{'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}]
-        }
-        mock_spot.return_value = mock_client
-        
-        bot = AggressiveRecoveryBot()
-        
-        # Add winning trades
-        for i in range(3):
-            pos = Position(
-                symbol='BTCUSDT',
-                side='BUY',
-                entry_price=30000.0,
-                quantity=0.01,
-                stop_loss=29000.0,
-                take_profit=31000.0,
-                confluence_score=5
-            )
-            pos.exit_price = 31000.0
-            pos.exit_time = datetime.now(UTC)
-            pos.profit_amount = 10.0
-            pos.profit_percent = 3.33
-            bot.trade_history.add_trade(pos)
+        template = Position(
+            symbol='BTCUSDT',
+            side='BUY',
+            entry_price=30000.0,
+            quantity=0.01,
+            stop_loss=29000.0,
+            take_profit=31000.0,
+            confluence_score=5
+        )
         
-        # Add losing trades
-        for i in range(2):
-            pos = Position(
-                symbol='BTCUSDT',
-                side='BUY',
-                entry_price=30000.0,
-                quantity=0.01,
-                stop_loss=29000.0,
-                take_profit=31000.0,
-                confluence_score=5
-            )
-            pos.exit_price = 29000.0
-            pos.exit_time = datetime.now(UTC)
-            pos.profit_amount = -10.0
-            pos.profit_percent = -3.33
+        # 3 winning trades, then 2 losing trades
+        for profit in (10.0, 10.0, 10.0, -10.0, -10.0):
+            pos = copy.copy(template)
+            pos.exit_price = 31000.0 if profit > 0 else 29000.0
+            pos.exit_time = NOW
+            pos.profit_amount = profit
+            pos.profit_percent = 3.33 if profit > 0 else -3.33
             bot.trade_history.add_trade(pos)
         
         win_rate = bot.trade_history.get_win_rate()
@@ -5,11 +5,6 @@ Run: pytest tests/test_config_system.py -v
 
 import pytest
 import yaml
-from pathlib import Path
-import sys
-
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.config_loader import ConfigLoader
 from config.migrations import ConfigMigration
@@ -48,6 +43,16 @@ class TestConfigTemplates:
         assert config['strategy_name'] == 'Balanced Scalping'
         assert config['max_positions'] == 7
     
+    def test_template_copies_are_independent(self):
+        """Test mutating a loaded template doesn't leak into the next load"""
+        config = ConfigLoader.load_template('safe')
+        config['min_signal_strength'] = 10.0
+        config['risk_management']['atr_sl_multiplier'] = 99.0
+        
+        fresh = ConfigLoader.load_template('safe')
+        assert fresh['min_signal_strength'] == 4.5
+        assert fresh['risk_management']['atr_sl_multiplier'] == 1.5
+    
     def test_list_templates(self):
         """Test listing all templates"""
         templates = ConfigLoader.list_templates()
@@ -250,6 +255,3 @@ take_profit_pct: 2.0
         assert is_valid is True
         assert config['config_version'] == '2.0'
 
-
-if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
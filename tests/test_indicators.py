@@ -11,7 +11,7 @@ class TestIndicators:
     
     def test_rsi_calculation(self, sample_price_data):
         """Test RSI indicator calculation"""
-        close_prices = sample_price_data['close']
+        close_prices = sample_price_data.close
         rsi = Indicators.calculate_rsi(close_prices, period=14)
         
         # RSI should be between 0 and 100
@@ -32,7 +32,7 @@ class TestIndicators:
     
     def test_bollinger_bands(self, sample_price_data):
         """Test Bollinger Bands calculation"""
-        close_prices = sample_price_data['close']
+        close_prices = sample_price_data.close
         upper, middle, lower = Indicators.calculate_bollinger_bands(close_prices, period=20, std_dev=2)
         
         # Upper should be above middle, middle above lower
@@ -44,7 +44,7 @@ class TestIndicators:
         
     def test_macd(self, sample_price_data):
         """Test MACD calculation"""
-        close_prices = sample_price_data['close']
+        close_prices = sample_price_data.close
         macd_line, signal_line, histogram = Indicators.calculate_macd(
             close_prices, fast=12, slow=26, signal=9
         )
@@ -60,9 +60,9 @@ class TestIndicators:
         
     def test_atr(self, sample_price_data):
         """Test ATR (Average True Range) calculation"""
-        high = sample_price_data['high']
-        low = sample_price_data['low']
-        close = sample_price_data['close']
+        high = sample_price_data.high
+        low = sample_price_data.low
+        close = sample_price_data.close
         
         atr = Indicators.calculate_atr(high, low, close, period=14)
         
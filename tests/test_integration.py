@@ -2,51 +2,48 @@
 Integration Tests - Test complete workflows
 """
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 import numpy as np
 from datetime import datetime, UTC
 
+from bots.aggressive_recovery_bot import AggressiveRecoveryBot
+from core.models import Position
+
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
+# 50 one-minute candles rising +10/candle, as raw Binance strings (built once)
+_KLINES_UPTREND = [
+    [i*60000, f"{29000+i*10}", f"{29100+i*10}", f"{28900+i*10}",
+     f"{29050+i*10}", '100.0', (i+1)*60000-1, '2900000', 100, '50', '1450000', '0']
+    for i in range(50)
+]
+
+
+@pytest.fixture(scope="module")
+def _spot_patch():
+    """Patch the bot's Spot class once for the module"""
+    with patch('bots.aggressive_recovery_bot.Spot') as mock_spot:
+        yield mock_spot
+
+
+@pytest.fixture
+def mock_binance_spot(_spot_patch, mock_binance_client):
+    """Fresh mocked client (USDT balance + flat klines) behind the patched Spot"""
+    _spot_patch.return_value = mock_binance_client
+    return mock_binance_client
+
 
 class TestTradingWorkflow:
     """Test complete trading workflow"""
     
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_bot_initialization(self, mock_spot):
+    def test_bot_initialization(self, mock_binance_spot):
         """Test bot can initialize properly"""
-        # Mock Binance client
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [
-                {'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}
-            ]
-        }
-        mock_spot.return_value = mock_client
-        
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
         bot = AggressiveRecoveryBot()
         assert bot is not None
         assert bot.trade_history.daily_start_balance > 0
         
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_signal_generation(self, mock_spot):
+    def test_signal_generation(self, mock_binance_spot):
         """Test signal generation from market data"""
-        # Mock Binance client
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [
-                {'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}
-            ]
-        }
-        mock_client.klines.return_value = [
-            [1609459200000, '29000.00', '29500.00', '28800.00', '29200.00', '100.5',
-             1609462799999, '2920000.00', 150, '50.2', '1460400.00', '0']
-        ] * 50
-        
-        mock_spot.return_value = mock_client
-        
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        
         bot = AggressiveRecoveryBot()
         
         # Get market data
@@ -63,115 +60,89 @@ class TestTradingWorkflow:
 class TestDatabaseIntegration:
     """Test database operations"""
     
-    def test_database_initialization(self):
+    def test_database_initialization(self, db_session):
         """Test database can be initialized"""
-        from database.db import init_db, SessionLocal
+        from sqlalchemy import inspect
+        from database.models import Base
         
-        try:
-            init_db()
-            session = SessionLocal()
-            session.close()
-        except Exception as e:
-            pytest.fail(f"Database initialization failed: {e}")
+        tables = set(inspect(db_session.connection()).get_table_names())
+        assert set(Base.metadata.tables) <= tables
             
-    def test_create_user(self):
+    def test_create_user(self, db_session):
         """Test creating a user in database"""
-        from database.db import SessionLocal
         from database.models import User
         
-        session = SessionLocal()
+        user = User(
+            username="testuser",
+            email="test@example.com",
+            hashed_password="hashed_password"
+        )
+        db_session.add(user)
+        db_session.commit()
+        
+        # Query user back
+        retrieved = db_session.query(User).filter_by(username="testuser").first()
+        assert retrieved is not None
+        assert retrieved.email == "test@example.com"
+            
+    def test_timestamps_on_legacy_schema(self, monkeypatch):
+        """Rows get created_at even when the table has no DB-side default"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from database.models import User
         
-        try:
-            user = User(
-                username="testuser",
-                email="test@example.com",
-                hashed_password="hashed_password"
-            )
+        # Tables created before server_default=func.now() existed
+        engine = create_engine("sqlite:///:memory:")
+        monkeypatch.setattr(User.__table__.c.created_at, "server_default", None)
+        User.__table__.create(engine)
+        monkeypatch.undo()
+        
+        with Session(engine) as session:
+            user = User(username="legacy", email="legacy@example.com", hashed_password="hashed")
             session.add(user)
             session.commit()
+            assert session.get(User, user.id).created_at is not None
             
-            # Query user back
-            retrieved = session.query(User).filter_by(username="testuser").first()
-            assert retrieved is not None
-            assert retrieved.email == "test@example.com"
-            
-            # Cleanup
-            session.delete(retrieved)
-            session.commit()
-            
-        finally:
-            session.close()
-            
-    def test_create_trade_record(self):
+    def test_create_trade_record(self, db_session):
         """Test creating trade records"""
-        from database.db import SessionLocal
         from database.models import User, Trade
         
-        session = SessionLocal()
-        
-        try:
-            # Create user first
-            user = User(
-                username="trader",
-                email="trader@example.com",
-                hashed_password="hashed"
-            )
-            session.add(user)
-            session.commit()
-            
-            # Create trade
-            trade = Trade(
-                user_id=user.id,
-                symbol="BTCUSDT",
-                side="BUY",
-                entry_price=30000.0,
-                quantity=0.01,
-                profit_loss_usd=100.0,
-                profit_loss_percent=3.33,
-                status="CLOSED"
-            )
-            session.add(trade)
-            session.commit()
-            
-            # Verify
-            retrieved = session.query(Trade).filter_by(symbol="BTCUSDT").first()
-            assert retrieved is not None
-            assert retrieved.profit_loss_usd == 100.0
-            
-            # Cleanup
-            session.delete(trade)
-            session.delete(user)
-            session.commit()
-            
-        finally:
-            session.close()
+        # Create user first
+        user = User(
+            username="trader",
+            email="trader@example.com",
+            hashed_password="hashed"
+        )
+        db_session.add(user)
+        db_session.commit()
+        
+        # Create trade
+        trade = Trade(
+            user_id=user.id,
+            symbol="BTCUSDT",
+            side="BUY",
+            entry_price=30000.0,
+            quantity=0.01,
+            profit_loss_usd=100.0,
+            profit_loss_percent=3.33,
+            status="CLOSED"
+        )
+        db_session.add(trade)
+        db_session.commit()
+        
+        # Verify
+        retrieved = db_session.query(Trade).filter_by(symbol="BTCUSDT").first()
+        assert retrieved is not None
+        assert retrieved.profit_loss_usd == 100.0
 
 
 class TestEndToEnd:
     """End-to-end integration tests"""
     
-    @patch('bots.aggressive_recovery_bot.Spot')
-    def test_complete_trade_cycle(self, mock_spot):
+    def test_complete_trade_cycle(self, mock_binance_spot):
         """Test complete trade cycle: entry -> monitoring -> exit"""
-        # Mock Binance client
-        mock_client = Mock()
-        mock_client.account.return_value = {
-            'balances': [
-                {'asset': 'USDT', 'free': '1000.00', 'locked': '0.00'}
-            ]
-        }
-        
         # Mock price data showing bullish trend
-        mock_client.klines.return_value = [
-            [i*60000, str(29000+i*10), str(29100+i*10), str(28900+i*10), 
-             str(29050+i*10), '100.0', (i+1)*60000-1, '2900000', 100, '50', '1450000', '0']
-            for i in range(50)
-        ]
-        
-        mock_spot.return_value = mock_client
-        
-        from bots.aggressive_recovery_bot import AggressiveRecoveryBot
-        from core.models import Position
+        mock_binance_spot.klines.return_value = _KLINES_UPTREND
         
         bot = AggressiveRecoveryBot()
         
@@ -201,7 +172,7 @@ class TestEndToEnd:
             # Simulate price reaching TP
             exit_price = position.take_profit
             position.exit_price = exit_price
-            position.exit_time = datetime.now(UTC)
+            position.exit_time = NOW
             
             # Calculate P&L
             profit_pct = ((exit_price - position.entry_price) / position.entry_price) * 100
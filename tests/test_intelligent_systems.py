@@ -342,14 +342,45 @@ class TestTrailingStop:
         
         # Stop loss should have moved down
         assert position.stop_loss <= 31000.0
+        
+    def test_batch_update_matches_scalar(self):
+        """Test vectorized trailing stop update matches per-position updates"""
+        from modules.trailing_stop import TrailingStopManager
+        from core.models import Position
+        
+        tsm = TrailingStopManager(trail_percent=1.5, activation_profit=2.0)
+        
+        def make_positions():
+            return [
+                Position('BTCUSDT', 'BUY', 30000.0, 0.01, 29000.0, 31000.0, 5),
+                Position('BTCUSDT', 'BUY', 30000.0, 0.01, 29000.0, 31000.0, 5),
+                Position('ETHUSDT', 'SELL', 2000.0, 0.1, 2100.0, 1900.0, 4),
+                Position('ETHUSDT', 'SELL', 2000.0, 0.1, 2100.0, 1900.0, 4),
+            ]
+        
+        prices = [30900.0, 30300.0, 1940.0, 1990.0]
+        
+        scalar = make_positions()
+        expected = [tsm.update_trailing_stop(p, price) for p, price in zip(scalar, prices)]
+        
+        batch = make_positions()
+        updated = tsm.update_trailing_stops_batch(batch, np.array(prices))
+        
+        assert updated.tolist() == expected
+        for s, b in zip(scalar, batch):
+            assert b.stop_loss == s.stop_loss
+            assert b.highest_price == s.highest_price
+            assert b.lowest_price == s.lowest_price
+            assert b.trailing_stop_active == s.trailing_stop_active
 
 
 class TestTelegramCommands:
     """Test Telegram command handler"""
     
-    @patch('utils.telegram_commands.requests.post')
-    def test_send_message(self, mock_post):
+    @patch('utils.telegram_commands.get_telegram_session')
+    def test_send_message(self, mock_session):
         """Test sending Telegram message"""
+        mock_post = mock_session.return_value.post
         # Mock successful response
         mock_response = Mock()
         mock_response.status_code = 200
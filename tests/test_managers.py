@@ -2,6 +2,7 @@
 Unit Tests for Manager classes
 """
 import pytest
+import numpy as np
 from managers.position_manager import PositionManager
 from managers.symbol_manager import SymbolManager
 from core.models import Position
@@ -109,6 +110,40 @@ class TestPositionManager:
         count = manager.get_symbol_position_count('BTCUSDT')
         assert count == 2
 
+    def test_can_open_position(self):
+        """Test total and per-symbol limits in can_open_position"""
+        manager = PositionManager(max_total_positions=3, max_per_symbol=2)
+
+        assert manager.can_open_position('BTCUSDT') is True
+
+        for i in range(2):
+            manager.add_position(Position(
+                symbol='BTCUSDT',
+                side='BUY',
+                entry_price=30000.0 + i*100,
+                quantity=0.01,
+                stop_loss=29000.0,
+                take_profit=31000.0,
+                confluence_score=5
+            ))
+
+        # Per-symbol limit reached, other symbols still allowed
+        assert manager.can_open_position('BTCUSDT') is False
+        assert manager.can_open_position('ETHUSDT') is True
+
+        manager.add_position(Position(
+            symbol='ETHUSDT',
+            side='BUY',
+            entry_price=2000.0,
+            quantity=0.1,
+            stop_loss=1900.0,
+            take_profit=2100.0,
+            confluence_score=4
+        ))
+
+        # Total limit reached
+        assert manager.can_open_position('BNBUSDT') is False
+
 
 class TestSymbolManager:
     """Test SymbolManager"""
@@ -156,3 +191,66 @@ class TestSymbolManager:
         import time
         time.sleep(1.1)
         assert manager.should_rotate() is True
+
+    def test_rotate_symbols_by_momentum(self):
+        """Test rotation picks top momentum symbols and keeps open positions"""
+        symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'ADAUSDT']
+        manager = SymbolManager(
+            symbol_pool=symbols,
+            max_active=2,
+            rotation_interval=300
+        )
+        
+        # No momentum yet - ties keep pool order
+        assert sorted(manager.rotate_symbols({})) == ['BTCUSDT', 'ETHUSDT']
+        
+        for symbol, change in [('BTCUSDT', 1.0), ('ETHUSDT', 5.0), ('BNBUSDT', 3.0), ('ADAUSDT', 4.0)]:
+            manager.update_momentum(symbol, {"price_change_pct": change})
+        
+        top = manager.get_top_momentum_symbols(2)
+        assert [symbol for symbol, _ in top] == ['ETHUSDT', 'ADAUSDT']
+        
+        active = manager.rotate_symbols({})
+        assert sorted(active) == ['ADAUSDT', 'ETHUSDT']
+        assert manager.is_symbol_active('ETHUSDT')
+        assert not manager.is_symbol_active('BTCUSDT')
+        
+        # Unchanged set keeps the existing list
+        assert manager.rotate_symbols({}) is manager.active_symbols
+        assert manager.rotate_symbols({}) == active
+        
+        # Symbol with an open position is never rotated out
+        active = manager.rotate_symbols({'BTCUSDT': 1})
+        assert active == ['BTCUSDT', 'ETHUSDT']
+    
+    def test_top_momentum_ties_keep_pool_order(self):
+        """Equal scores rank in symbol pool order"""
+        symbols = [f'SYM{i}USDT' for i in range(40)]
+        manager = SymbolManager(
+            symbol_pool=symbols,
+            max_active=5,
+            rotation_interval=300
+        )
+        
+        for i, change in [(3, 5.0), (17, 4.0), (30, 3.0)]:
+            manager.update_momentum(symbols[i], {"price_change_pct": change})
+        
+        top = manager.get_top_momentum_symbols(5)
+        assert [symbol for symbol, _ in top] == [symbols[i] for i in (3, 17, 30, 0, 1)]
+
+    def test_momentum_batch_matches_scalar(self):
+        """Test vectorized momentum scoring matches the scalar version"""
+        symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
+        manager = SymbolManager(symbol_pool=symbols, max_active=2)
+        data = {
+            "price_change_pct": np.array([1.5, -2.0, 0.0]),
+            "volume_ratio": np.array([1.0, 8.0, 0.5]),
+            "atr": np.array([300.0, 20.0, 1.0]),
+            "current_price": np.array([30000.0, 2000.0, 0.0])
+        }
+        
+        manager.update_momentum_batch(symbols, data)
+        
+        for i, symbol in enumerate(symbols):
+            expected = manager.calculate_momentum_score({k: v[i] for k, v in data.items()})
+            assert manager.get_symbol_score(symbol) == pytest.approx(expected)
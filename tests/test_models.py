@@ -5,6 +5,9 @@ import pytest
 from datetime import datetime, UTC
 from core.models import Position, TradeHistory
 
+# Frozen exit time for closed positions
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
+
 
 class TestPosition:
     """Test Position model"""
@@ -64,6 +67,22 @@ class TestPosition:
         assert position.side == 'SELL'
         assert position.stop_loss > position.entry_price  # SL above entry for SELL
         assert position.take_profit < position.entry_price  # TP below entry for SELL
+    
+    def test_held_seconds(self, monkeypatch):
+        """Test hold time is measured on the monotonic clock"""
+        monkeypatch.setattr('core.models.time.monotonic', lambda: 1000.0)
+        position = Position(
+            symbol='BTCUSDT',
+            side='BUY',
+            entry_price=30000.0,
+            quantity=0.01,
+            stop_loss=29000.0,
+            take_profit=31000.0,
+            confluence_score=5
+        )
+        
+        monkeypatch.setattr('core.models.time.monotonic', lambda: 1150.0)
+        assert position.held_seconds() == 150.0
 
 
 class TestTradeHistory:
@@ -91,7 +110,7 @@ class TestTradeHistory:
             confluence_score=5
         )
         position.exit_price = 31000.0
-        position.exit_time = datetime.now(UTC)
+        position.exit_time = NOW
         position.profit_percent = 3.33
         position.profit_amount = 10.0
         
@@ -114,7 +133,7 @@ class TestTradeHistory:
             confluence_score=5
         )
         position.exit_price = 29000.0
-        position.exit_time = datetime.now(UTC)
+        position.exit_time = NOW
         position.profit_percent = -3.33
         position.profit_amount = -10.0
         
@@ -139,7 +158,7 @@ class TestTradeHistory:
                 confluence_score=5
             )
             position.exit_price = 31000.0
-            position.exit_time = datetime.now(UTC)
+            position.exit_time = NOW
             position.profit_percent = 3.33
             position.profit_amount = 10.0
             history.add_trade(position)
@@ -156,7 +175,7 @@ class TestTradeHistory:
                 confluence_score=5
             )
             position.exit_price = 29000.0
-            position.exit_time = datetime.now(UTC)
+            position.exit_time = NOW
             position.profit_percent = -3.33
             position.profit_amount = -10.0
             history.add_trade(position)
@@ -179,7 +198,7 @@ class TestTradeHistory:
             confluence_score=5
         )
         position.exit_price = 31000.0
-        position.exit_time = datetime.now(UTC)
+        position.exit_time = NOW
         position.profit_percent = 3.33
         position.profit_amount = 10.0  # $10 profit
         history.add_trade(position)
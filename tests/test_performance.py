@@ -5,6 +5,10 @@ import pytest
 import time
 from unittest.mock import Mock, patch
 import numpy as np
+from datetime import datetime, UTC
+
+# Frozen exit time for closed positions
+NOW = datetime(2024, 1, 1, tzinfo=UTC)
 
 
 class TestIndicatorPerformance:
@@ -115,13 +119,8 @@ class TestPositionManagerPerformance:
 class TestAPILoadSimulation:
     """Test API under load"""
     
-    def test_concurrent_requests(self):
+    def test_concurrent_requests(self, client):
         """Test handling multiple API requests"""
-        from fastapi.testclient import TestClient
-        from app import app
-        
-        client = TestClient(app)
-        
         # Simulate 20 concurrent health checks
         start = time.time()
         responses = []
@@ -135,13 +134,8 @@ class TestAPILoadSimulation:
         # Should complete in reasonable time
         assert duration < 5.0
         
-    def test_stats_endpoint_performance(self):
+    def test_stats_endpoint_performance(self, client):
         """Test stats endpoint response time"""
-        from fastapi.testclient import TestClient
-        from app import app
-        
-        client = TestClient(app)
-        
         start = time.time()
         for _ in range(50):
             response = client.get("/api/stats")
@@ -158,7 +152,6 @@ class TestMemoryUsage:
     def test_trade_history_memory(self):
         """Test trade history doesn't leak memory"""
         from core.models import TradeHistory, Position
-        from datetime import datetime, UTC
         
         history = TradeHistory(starting_balance=1000.0)
         
@@ -174,7 +167,7 @@ class TestMemoryUsage:
                 confluence_score=5
             )
             pos.exit_price = 31000.0 if i % 2 == 0 else 29000.0
-            pos.exit_time = datetime.now(UTC)
+            pos.exit_time = NOW
             pos.profit_amount = 10.0 if i % 2 == 0 else -10.0
             pos.profit_percent = 3.33 if i % 2 == 0 else -3.33
             
@@ -193,6 +186,25 @@ class TestMemoryUsage:
         
         # Should be limited to maxlen (500)
         assert len(log_buffer) <= 500
+        
+    def test_active_config_cache_limit(self, monkeypatch):
+        """Test active config cache drops expired entries and stays bounded"""
+        from routers import bot
+        
+        monkeypatch.setattr(bot, "_active_config_cache", {})
+        monkeypatch.setattr(bot, "ACTIVE_CONFIG_CACHE_MAX", 10)
+        
+        # Expired entries are evicted on the next insert
+        for user_id in range(5):
+            bot._cache_active_config(user_id, {}, now=0.0)
+        bot._cache_active_config(99, {}, now=bot.ACTIVE_CONFIG_TTL + 1)
+        assert list(bot._active_config_cache) == [99]
+        
+        # Live entries are capped, oldest dropped first
+        for user_id in range(100):
+            bot._cache_active_config(user_id, {}, now=100.0)
+        assert len(bot._active_config_cache) == 10
+        assert list(bot._active_config_cache) == list(range(90, 100))
 
 
 class TestDataValidation:
@@ -215,13 +227,9 @@ class TestDataValidation:
         assert pos.entry_price > 0
         assert pos.quantity > 0
         
-    def test_api_input_sanitization(self):
+    @pytest.mark.xdist_group(name="bot_runtime")
+    def test_api_input_sanitization(self, client):
         """Test API input validation"""
-        from fastapi.testclient import TestClient
-        from app import app
-        
-        client = TestClient(app)
-        
         # Test XSS attempt
         response = client.post(
             "/api/bot/start",
@@ -230,25 +238,18 @@ class TestDataValidation:
         # Should handle gracefully
         assert response.status_code in [200, 400, 422]
         
-    def test_sql_injection_prevention(self):
+    def test_sql_injection_prevention(self, db_session):
         """Test SQL injection prevention in database queries"""
-        from database.db import SessionLocal
         from database.models import User
         
-        session = SessionLocal()
+        # Try SQL injection in username
+        malicious_username = "admin' OR '1'='1"
         
-        try:
-            # Try SQL injection in username
-            malicious_username = "admin' OR '1'='1"
-            
-            # Should not execute SQL, should treat as string
-            user = session.query(User).filter_by(username=malicious_username).first()
-            
-            # Should return None (no such user)
-            assert user is None
-            
-        finally:
-            session.close()
+        # Should not execute SQL, should treat as string
+        user = db_session.query(User).filter_by(username=malicious_username).first()
+        
+        # Should return None (no such user)
+        assert user is None
 
 
 class TestEdgeCases:
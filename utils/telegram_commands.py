@@ -1,10 +1,11 @@
 ﻿import threading
 import time
-import requests
 from datetime import datetime, UTC
 from typing import Dict, List
 import logging
 
+from utils.telegram_session import get_telegram_session
+
 logger = logging.getLogger(__name__)
 
 class TelegramCommandHandler:
@@ -13,6 +14,9 @@ class TelegramCommandHandler:
         self.bot_token = bot_token
         self.chat_id = chat_id
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
+        # Endpoint URLs joined once - polled every second / per reply
+        self._get_updates_url = f"{self.base_url}/getUpdates"
+        self._send_message_url = f"{self.base_url}/sendMessage"
         self.last_update_id = 0
         self.running = True
         
@@ -48,9 +52,8 @@ class TelegramCommandHandler:
     
     def get_updates(self) -> List[Dict]:
         try:
-            url = f"{self.base_url}/getUpdates"
             params = {"offset": self.last_update_id + 1, "timeout": 30}
-            response = requests.get(url, params=params, timeout=35)
+            response = get_telegram_session().get(self._get_updates_url, params=params, timeout=35)
             
             if response.status_code == 200:
                 data = response.json()
@@ -89,9 +92,8 @@ class TelegramCommandHandler:
     
     def send_message(self, chat_id: str, text: str):
         try:
-            url = f"{self.base_url}/sendMessage"
             data = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
-            requests.post(url, data=data, timeout=10)
+            get_telegram_session().post(self._send_message_url, data=data, timeout=10)
         except Exception as e:
             logger.error(f"Send message error: {e}")
     
@@ -287,7 +289,7 @@ class TelegramCommandHandler:
                 pnl = 0.0
             
             # Time in position
-            time_elapsed = (datetime.now(UTC) - pos.entry_time).total_seconds()
+            time_elapsed = pos.held_seconds()
             time_str = f"{int(time_elapsed//60)}m{int(time_elapsed%60)}s"
             
             # Trailing stop indicator
@@ -0,0 +1,25 @@
+"""
+Shared HTTP session for the Telegram Bot API
+Keeps one pooled keep-alive connection to api.telegram.org
+"""
+
+from functools import lru_cache
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+@lru_cache(maxsize=None)
+def get_telegram_session() -> requests.Session:
+    """
+    Process-wide session reused by every sendMessage/getUpdates call
+
+    The TCP + TLS handshake is paid once, not per message. Retry covers
+    connection errors only: POST is not in urllib3's default
+    allowed_methods, so a sent message is never re-posted.
+    """
+    session = requests.Session()
+    retry = Retry(total=1, backoff_factor=0.2)
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+    return session